@@ -1,28 +1,33 @@
 from fastapi import APIRouter, HTTPException, status
 
-from backend.db.database import get_db
+from backend.core.security import PasswordHasherBusyError
+from backend.db.async_database import get_async_db
 from backend.models.auth_schemas import UserRegister, UserLogin, Token, UserResponse
-from backend.services.auth_service import register_user, authenticate_user, generate_token
+from backend.services.auth_service import register_user_async, authenticate_user_async, generate_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister):
+async def register(user_data: UserRegister):
     try:
-        with get_db() as conn:
-            user = register_user(conn, user_data.username, user_data.password)
+        async with get_async_db(transaction=True) as conn:
+            user = await register_user_async(conn, user_data.username, user_data.password)
         return user
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PasswordHasherBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin):
+async def login(credentials: UserLogin):
     try:
-        with get_db() as conn:
-            user = authenticate_user(conn, credentials.username, credentials.password)
+        async with get_async_db() as conn:
+            user = await authenticate_user_async(conn, credentials.username, credentials.password)
         token = generate_token(user["username"])
         return Token(access_token=token)
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    except PasswordHasherBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
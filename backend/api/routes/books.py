@@ -1,49 +1,99 @@
-import time
+from typing import AsyncIterator
 from fastapi import APIRouter, HTTPException, Depends
-from backend.models.schemas import BookSearchRequest, BookSearchResponse, BookResult
+from fastapi.responses import StreamingResponse
+from backend.models.schemas import BookSearchRequest, BookSearchResponse
 from backend.services.ollama_service import ollama_service
 from backend.services.google_books_service import google_books_service
-from backend.core.metrics import record_request, record_request_duration
+from backend.services.book_catalog import book_catalog
+from backend.services.book_index import book_index
 from backend.core.dependencies import get_current_user
+from backend.core.responses import ORJSONResponse, ndjson_line
+from backend.core.timing import span
 
 router = APIRouter()
 
 
+BOOK_FIELDS = ("title", "authors", "description", "categories", "thumbnail")
+
+
+def _build_book(item: dict) -> dict:
+    return {field: item.get(field) for field in BOOK_FIELDS}
+
+
+def _query_keywords(keywords: dict) -> str:
+    return f"{keywords['keyword_1']} {keywords['keyword_2']} {keywords['keyword_3']}"
+
+
+def _local_page(result: dict, max_results: int) -> dict:
+    items = result["items"][:max_results]
+    return {"total_items": len(items), "items": items}
+
+
+async def _find_books(keywords: dict, start_index: int, max_results: int) -> dict:
+    if start_index == 0 and not google_books_service.is_cached(keywords, start_index, max_results):
+        if max_results <= book_index.max_results:
+            result = book_index.search(keywords)
+            if result is not None:
+                return _local_page(result, max_results)
+        if max_results <= book_catalog.max_results:
+            with span("book_catalog"):
+                result = await book_catalog.search(keywords)
+            if result is not None:
+                book_index.add_many(result["items"])
+                return _local_page(result, max_results)
+    
+    with span("google_books"):
+        result = await google_books_service.search_books(keywords, start_index, max_results)
+    book_index.add_many(result["items"])
+    return result
+
+
 @router.post("/search", response_model=BookSearchResponse)
 async def search_books(
     request: BookSearchRequest,
     current_user: dict = Depends(get_current_user)
 ):
-    start = time.time()
-    
     try:
-        keywords = await ollama_service.extract_keywords(request.description)
-        
-        result = await google_books_service.search_books(keywords)
-        
-        books = [
-            BookResult(
-                title=item.get("title"),
-                authors=item.get("authors"),
-                description=item.get("description"),
-                categories=item.get("categories"),
-                thumbnail=item.get("thumbnail")
-            )
-            for item in result["items"]
-        ]
+        with span("keywords"):
+            keywords = await ollama_service.extract_keywords(request.description)
         
-        query_keywords = f"{keywords['keyword_1']} {keywords['keyword_2']} {keywords['keyword_3']}"
+        with span("books"):
+            result = await _find_books(keywords, request.start_index, request.max_results)
         
-        record_request("POST", "/books/search", 200)
-        record_request_duration("POST", "/books/search", time.time() - start)
-        
-        return BookSearchResponse(
-            total_items=result["total_items"],
-            query_keywords=query_keywords,
-            items=books
-        )
+        with span("render"):
+            books = [_build_book(item) for item in result["items"]]
+            
+            query_keywords = _query_keywords(keywords)
+            
+            return ORJSONResponse({
+                "total_items": result["total_items"],
+                "query_keywords": query_keywords,
+                "items": books
+            })
     
     except Exception as e:
-        record_request("POST", "/books/search", 500)
-        record_request_duration("POST", "/books/search", time.time() - start)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/search/stream")
+async def search_books_stream(
+    request: BookSearchRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            with span("keywords"):
+                keywords = await ollama_service.extract_keywords_streaming(request.description)
+            yield ndjson_line({"type": "keywords", "query_keywords": _query_keywords(keywords)})
+            
+            with span("books"):
+                result = await _find_books(keywords, request.start_index, request.max_results)
+            for item in result["items"]:
+                yield ndjson_line({"type": "book", "item": _build_book(item)})
+            
+            yield ndjson_line({"type": "done", "total_items": result["total_items"]})
+        
+        except Exception as e:
+            yield ndjson_line({"type": "error", "detail": str(e)})
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,22 +1,73 @@
-from fastapi import APIRouter, Response
+import asyncio
+import gzip
+from fastapi import APIRouter, Header, Response
 from backend.models.schemas import HealthResponse
-from backend.core.metrics import record_request, get_metrics
+from backend.core.cache import TTLCache
+from backend.core.config import settings
+from backend.core.metrics import get_metrics
+from backend.core.singleflight import SingleFlight
 
 router = APIRouter()
 
+exposition_cache = TTLCache("metrics_exposition", maxsize=2, ttl=settings.metrics_cache_ttl)
+exposition_flights = SingleFlight("metrics_exposition")
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for coding in accept_encoding.lower().split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        if name != "gzip":
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _render(encoding: str) -> bytes:
+    payload = get_metrics()
+    if encoding == "gzip":
+        return gzip.compress(payload, compresslevel=settings.metrics_gzip_level)
+    return payload
+
+
+async def _load_exposition(encoding: str) -> bytes:
+    payload = await asyncio.to_thread(_render, encoding)
+    exposition_cache.set(encoding, payload)
+    return payload
+
+
+async def _exposition(encoding: str) -> bytes:
+    payload = exposition_cache.get(encoding)
+    if payload is None:
+        payload = await exposition_flights.do(encoding, lambda: _load_exposition(encoding))
+    return payload
+
 
 @router.get("/", response_model=dict)
 async def root():
-    record_request("GET", "/", 200)
     return {"message": "Atlas Reliability Framework"}
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health():
-    record_request("GET", "/health", 200)
     return HealthResponse(status="healthy")
 
 
 @router.get("/metrics")
-async def metrics():
-    return Response(content=get_metrics(), media_type="text/plain; charset=utf-8")
\ No newline at end of file
+async def metrics(accept_encoding: str = Header(default="")):
+    encoding = "gzip" if _accepts_gzip(accept_encoding) else "identity"
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding == "gzip":
+        headers["Content-Encoding"] = "gzip"
+    
+    return Response(
+        content=await _exposition(encoding),
+        media_type="text/plain; charset=utf-8",
+        headers=headers
+    )
@@ -0,0 +1,79 @@
+import argparse
+import json
+import sys
+from typing import Dict
+
+from backend.benchmarks.load.fakes import FakeConfig, parse_latency
+from backend.benchmarks.load.postgres import PostgresFixture
+from backend.benchmarks.load.runner import LoadConfig, compare, run
+
+
+def _latency(spec: str) -> str:
+    try:
+        parse_latency(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return spec
+
+
+def _env(pair: str) -> tuple:
+    name, separator, value = pair.partition("=")
+    if not separator or not name:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got '{pair}'")
+    return name, value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive /books/search end to end against local fake upstreams")
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--distinct-descriptions", type=int, default=200)
+    parser.add_argument("--max-results", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--ollama-latency", type=_latency, default="lognormal:150:0.4")
+    parser.add_argument("--ollama-error-rate", type=float, default=0.0)
+    parser.add_argument("--google-latency", type=_latency, default="lognormal:80:0.5")
+    parser.add_argument("--google-error-rate", type=float, default=0.0)
+    parser.add_argument("--google-total-items", type=int, default=500)
+    parser.add_argument("--description-bytes", type=int, default=600)
+    parser.add_argument("--database-url")
+    parser.add_argument("--env", type=_env, action="append", default=[])
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+    
+    config = LoadConfig(
+        concurrency=[int(level) for level in args.concurrency.split(",")],
+        duration=args.duration,
+        warmup=args.warmup,
+        distinct_descriptions=args.distinct_descriptions,
+        max_results=args.max_results,
+        workers=args.workers,
+        env=dict(args.env)
+    )
+    ollama = FakeConfig(latency=args.ollama_latency, error_rate=args.ollama_error_rate)
+    google_books = FakeConfig(
+        latency=args.google_latency,
+        error_rate=args.google_error_rate,
+        total_items=args.google_total_items,
+        description_bytes=args.description_bytes
+    )
+    
+    with PostgresFixture(args.database_url) as database:
+        report = run(config, ollama, google_books, database.url)
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline: Dict = json.load(handle)
+        report["comparison"] = compare(baseline, report)
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
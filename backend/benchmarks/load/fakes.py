@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import random
+import re
+from dataclasses import dataclass
+from typing import Callable, List
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+from backend.core.responses import ORJSONResponse, ndjson_line
+
+VOCABULARY = (
+    "dragon", "magic", "quest", "space", "robot", "detective", "murder", "romance", "war", "empire",
+    "pirate", "ocean", "mountain", "kingdom", "witch", "vampire", "galaxy", "heist", "spy", "island"
+)
+
+_NUMBERED_LINE = re.compile(r"^(\d+)\. (.*)$", re.MULTILINE)
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    kind, *params = spec.split(":")
+    try:
+        values = [float(param) for param in params]
+    except ValueError:
+        values = []
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: random.lognormvariate(0.0, values[1]) * values[0] / 1000
+    raise ValueError(f"Unknown latency spec '{spec}', expected fixed:MS, uniform:MIN_MS:MAX_MS or lognormal:MEDIAN_MS:SIGMA")
+
+
+@dataclass
+class FakeConfig:
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    total_items: int = 500
+    description_bytes: int = 600
+
+
+def _words(text: str, count: int = 3) -> List[str]:
+    digest = hashlib.sha256(text.encode()).digest()
+    return [VOCABULARY[digest[index] % len(VOCABULARY)] for index in range(count)]
+
+
+async def _delay_or_fail(config: FakeConfig, latency: Callable[[], float]) -> bool:
+    await asyncio.sleep(latency())
+    return random.random() < config.error_rate
+
+
+def create_ollama_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI()
+    latency = parse_latency(config.latency)
+    
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        if await _delay_or_fail(config, latency):
+            return Response(status_code=500)
+        
+        prompt = body["prompt"]
+        numbered = _NUMBERED_LINE.findall(prompt)
+        if numbered:
+            text = "\n".join(f"{number}: {' '.join(_words(description))}" for number, description in numbered)
+        else:
+            text = " ".join(_words(prompt))
+        
+        if not body.get("stream"):
+            return ORJSONResponse({"model": body.get("model"), "response": text, "done": True})
+        
+        async def chunks():
+            for token in text.split(" "):
+                yield ndjson_line({"response": token + " ", "done": False})
+            yield ndjson_line({"response": "", "done": True})
+        
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+    
+    return app
+
+
+def create_google_books_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI()
+    latency = parse_latency(config.latency)
+    filler = ("lorem ipsum dolor sit amet " * (config.description_bytes // 27 + 1))[:config.description_bytes]
+    
+    @app.get("/books/v1/volumes")
+    async def volumes(q: str = "", startIndex: int = 0, maxResults: int = 10):
+        if await _delay_or_fail(config, latency):
+            return Response(status_code=503)
+        
+        count = max(0, min(maxResults, config.total_items - startIndex))
+        return ORJSONResponse({
+            "totalItems": config.total_items,
+            "items": [
+                {
+                    "volumeInfo": {
+                        "title": f"{q.replace('+', ' ').title()} Volume {startIndex + index + 1}",
+                        "authors": [f"Author {(startIndex + index) % 97}"],
+                        "description": filler,
+                        "categories": ["Fiction"],
+                        "imageLinks": {"thumbnail": f"http://books.example/{startIndex + index}.jpg"}
+                    }
+                }
+                for index in range(count)
+            ]
+        })
+    
+    return app
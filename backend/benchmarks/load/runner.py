@@ -0,0 +1,223 @@
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import httpx
+import numpy as np
+
+from backend.benchmarks.load.fakes import VOCABULARY, FakeConfig, create_google_books_app, create_ollama_app
+from backend.benchmarks.load.postgres import free_port
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+FAKE_APPS = {
+    "ollama": create_ollama_app,
+    "google_books": create_google_books_app
+}
+
+
+@dataclass
+class LoadConfig:
+    concurrency: List[int] = field(default_factory=lambda: [1, 8, 32])
+    duration: float = 20.0
+    warmup: float = 3.0
+    distinct_descriptions: int = 200
+    max_results: int = 10
+    workers: int = 1
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+def _serve_fake(kind: str, config: FakeConfig, port: int) -> None:
+    import uvicorn
+    uvicorn.run(FAKE_APPS[kind](config), host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def _wait_for(url: str, alive: Callable[[], bool], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not alive():
+            raise RuntimeError(f"Process serving {url} exited during startup")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+@contextmanager
+def fake_server(kind: str, config: FakeConfig) -> Iterator[str]:
+    port = free_port()
+    process = multiprocessing.get_context("spawn").Process(target=_serve_fake, args=(kind, config, port), daemon=True)
+    process.start()
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_for(f"{base_url}/docs", process.is_alive)
+        yield base_url
+    finally:
+        process.terminate()
+        process.join(5)
+
+
+@contextmanager
+def app_server(env: Dict[str, str], workers: int = 1) -> Iterator[str]:
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "--factory", "backend.main:create_app",
+            "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+            "--log-level", "warning", "--no-access-log"
+        ],
+        cwd=REPO_ROOT,
+        env={**os.environ, **env}
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_for(f"{base_url}/health", lambda: process.poll() is None)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def make_descriptions(count: int) -> List[str]:
+    return [
+        f"A story about {VOCABULARY[index % len(VOCABULARY)]} and {VOCABULARY[(index // len(VOCABULARY)) % len(VOCABULARY)]}, volume {index}"
+        for index in range(count)
+    ]
+
+
+def login(base_url: str, username: str = "loadbench", password: str = "loadbench-password") -> str:
+    credentials = {"username": username, "password": password}
+    response = httpx.post(f"{base_url}/auth/register", json=credentials, timeout=30.0)
+    if response.status_code not in (201, 400):
+        response.raise_for_status()
+    response = httpx.post(f"{base_url}/auth/login", json=credentials, timeout=30.0)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def summarize(concurrency: int, latencies: List[float], errors: Dict[str, int], elapsed: float) -> Dict:
+    completed = len(latencies) + sum(errors.values())
+    summary = {
+        "concurrency": concurrency,
+        "requests": completed,
+        "errors": sum(errors.values()),
+        "error_breakdown": dict(sorted(errors.items())),
+        "rps": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": None,
+        "p95_ms": None,
+        "p99_ms": None
+    }
+    if latencies:
+        p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+        summary.update(p50_ms=round(float(p50), 3), p95_ms=round(float(p95), 3), p99_ms=round(float(p99), 3))
+    return summary
+
+
+async def run_level(
+    base_url: str,
+    token: str,
+    descriptions: List[str],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    max_results: int = 10
+) -> Dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60.0) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        deadline = measure_from + duration
+        
+        async def worker(offset: int) -> None:
+            index = offset
+            while True:
+                sent = time.perf_counter()
+                if sent >= deadline:
+                    return
+                body = {"description": descriptions[index % len(descriptions)], "max_results": max_results}
+                index += concurrency
+                try:
+                    response = await client.post("/books/search", json=body)
+                    outcome = None if response.status_code == 200 else str(response.status_code)
+                except httpx.HTTPError as e:
+                    outcome = type(e).__name__
+                if sent < measure_from:
+                    continue
+                if outcome is None:
+                    latencies.append(time.perf_counter() - sent)
+                else:
+                    errors[outcome] = errors.get(outcome, 0) + 1
+        
+        await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+        elapsed = time.perf_counter() - measure_from
+    
+    return summarize(concurrency, latencies, errors, elapsed)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(config: LoadConfig, ollama: FakeConfig, google_books: FakeConfig, database_url: str) -> Dict:
+    descriptions = make_descriptions(config.distinct_descriptions)
+    levels = []
+    
+    with fake_server("ollama", ollama) as ollama_url, fake_server("google_books", google_books) as google_books_url:
+        env = {
+            "OLLAMA_BASE_URL": ollama_url,
+            "GOOGLE_BOOKS_BASE_URL": f"{google_books_url}/books/v1/volumes",
+            "GOOGLE_BOOKS_HTTP2": "false",
+            "DATABASE_URL": database_url,
+            **config.env
+        }
+        for concurrency in config.concurrency:
+            with app_server(env, config.workers) as base_url:
+                token = login(base_url)
+                levels.append(asyncio.run(run_level(
+                    base_url, token, descriptions, concurrency, config.duration, config.warmup, config.max_results
+                )))
+    
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {"load": asdict(config), "ollama": asdict(ollama), "google_books": asdict(google_books)},
+        "levels": levels
+    }
+
+
+def compare(baseline: Dict, current: Dict) -> List[Dict]:
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    rows = []
+    for level in current["levels"]:
+        before = previous.get(level["concurrency"])
+        if before is None:
+            continue
+        row = {"concurrency": level["concurrency"], "baseline_commit": baseline.get("commit")}
+        for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            if before.get(metric) and level.get(metric) is not None:
+                row[f"{metric}_change_percent"] = round((level[metric] - before[metric]) / before[metric] * 100, 2)
+        row["errors_delta"] = level["errors"] - before["errors"]
+        rows.append(row)
+    return rows
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, FastAPI
+
+from backend.core.metrics import MetricsMiddleware
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    router = APIRouter()
+    
+    @router.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+    
+    app = FastAPI()
+    app.include_router(router, prefix="/books")
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, iterations: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/books/items/7",
+        "raw_path": b"/books/items/7",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80)
+    }
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        pass
+    
+    await app(dict(scope), receive, send)
+    start = time.process_time()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the per-request CPU added by MetricsMiddleware")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    apps = {False: build_app(False), True: build_app(True)}
+    timings = {False: [], True: []}
+    for _ in range(args.rounds):
+        for instrumented, app in apps.items():
+            timings[instrumented].append(asyncio.run(drive(app, args.iterations)))
+    
+    bare, instrumented = min(timings[False]), min(timings[True])
+    print(json.dumps({
+        "iterations": args.iterations,
+        "rounds": args.rounds,
+        "bare_us": round(bare * 1e6, 2),
+        "instrumented_us": round(instrumented * 1e6, 2),
+        "overhead_us": round((instrumented - bare) * 1e6, 2)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+import time
+from typing import Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.api.routes.books import _build_book
+from backend.core.responses import ORJSONResponse
+from backend.models.schemas import BookResult, BookSearchResponse
+
+
+def sample_result(items: int) -> Dict:
+    return {
+        "total_items": 1200,
+        "items": [
+            {
+                "title": f"Book {index}",
+                "authors": ["First Author", "Second Author"],
+                "description": "A long description of the book. " * 20,
+                "categories": ["Fiction", "Fantasy"],
+                "thumbnail": f"http://books.google.com/books/content?id={index}&printsec=frontcover&img=1"
+            }
+            for index in range(items)
+        ]
+    }
+
+
+def model_path(result: Dict) -> bytes:
+    books = [
+        BookResult(
+            title=item.get("title"),
+            authors=item.get("authors"),
+            description=item.get("description"),
+            categories=item.get("categories"),
+            thumbnail=item.get("thumbnail")
+        )
+        for item in result["items"]
+    ]
+    response = BookSearchResponse(total_items=result["total_items"], query_keywords="dragon quest magic", items=books)
+    validated = BookSearchResponse.model_validate(response, from_attributes=True)
+    content = jsonable_encoder(validated.model_dump(mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(result: Dict) -> bytes:
+    return ORJSONResponse({
+        "total_items": result["total_items"],
+        "query_keywords": "dragon quest magic",
+        "items": [_build_book(item) for item in result["items"]]
+    }).body
+
+
+def cpu_per_call(func: Callable[[Dict], bytes], result: Dict, iterations: int) -> float:
+    func(result)
+    start = time.process_time()
+    for _ in range(iterations):
+        func(result)
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-request CPU of the book search serialization paths")
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    
+    result = sample_result(args.items)
+    assert json.loads(model_path(result)) == json.loads(fast_path(result))
+    
+    model = cpu_per_call(model_path, result, args.iterations)
+    fast = cpu_per_call(fast_path, result, args.iterations)
+    print(json.dumps({
+        "items": args.items,
+        "iterations": args.iterations,
+        "model_path_us": round(model * 1e6, 2),
+        "fast_path_us": round(fast * 1e6, 2),
+        "saved_us": round((model - fast) * 1e6, 2),
+        "speedup": round(model / fast, 2)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from backend.core.metrics import record_cache_lookup, record_cache_eviction
+
+
+class TTLCache:
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Hashable, Any], int]] = None
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, float, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            found = self._lookup(key)
+        return found is not None and found[2]
+    
+    def _remove(self, key: Hashable) -> None:
+        size = self._entries.pop(key)[4]
+        self._bytes -= size
+    
+    def _lookup(self, key: Hashable) -> Optional[Tuple[Any, float, bool]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at, fresh_until, expires_at, _ = entry
+        now = time.monotonic()
+        if now >= expires_at:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value, now - stored_at, now < fresh_until
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            found = self._lookup(key)
+        if found is None or not found[2]:
+            record_cache_lookup(self.name, "miss")
+            return default
+        record_cache_lookup(self.name, "hit")
+        return found[0]
+    
+    def get_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            found = self._lookup(key)
+        if found is None:
+            record_cache_lookup(self.name, "miss")
+            return None
+        record_cache_lookup(self.name, "hit" if found[2] else "stale")
+        return found[0], found[1]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, age: float = 0.0) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl + self.stale_ttl <= age or self.maxsize <= 0:
+            return
+        now = time.monotonic()
+        stored_at = now - age
+        size = self.sizeof(key, value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, stored_at, stored_at + ttl, stored_at + ttl + self.stale_ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                record_cache_eviction(self.name)
+    
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,94 @@
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from backend.core.metrics import record_circuit_breaker_state
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        slow_call_threshold: float,
+        reset_timeout: float,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        record_circuit_breaker_state(self.name, self.state)
+    
+    def _transition(self, state: str) -> None:
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state != HALF_OPEN:
+            self._half_open_calls = 0
+        if state == CLOSED:
+            self._failures = 0
+        record_circuit_breaker_state(self.name, state)
+    
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.reset_timeout
+    
+    def _before_call(self) -> None:
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit breaker for {self.name} is open")
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                raise CircuitOpenError(f"Circuit breaker for {self.name} is half-open and probing")
+            self._half_open_calls += 1
+    
+    def _on_success(self) -> None:
+        if self.state == HALF_OPEN:
+            self._transition(CLOSED)
+        else:
+            self._failures = 0
+    
+    def _on_failure(self) -> None:
+        if self.state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        self._failures += 1
+        if self.state == CLOSED and self._failures >= self.failure_threshold:
+            self._transition(OPEN)
+    
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        self._before_call()
+        probing = self.state == HALF_OPEN
+        start = time.monotonic()
+        
+        try:
+            result = await func()
+        except Exception:
+            self._on_failure()
+            raise
+        except BaseException:
+            if probing and self.state == HALF_OPEN:
+                self._half_open_calls -= 1
+            raise
+        
+        if time.monotonic() - start >= self.slow_call_threshold:
+            self._on_failure()
+        else:
+            self._on_success()
+        return result
@@ -1,13 +1,21 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from backend.db.database import get_connection
-from backend.services.auth_service import verify_token
+from backend.core.metrics import record_authenticated_request
+from backend.core.timing import span
+from backend.db.async_database import get_async_db
+from backend.services.auth_service import verify_token, user_cache
 
 security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    with span("auth"):
+        return await _authenticate(credentials)
+
+
+async def _authenticate(credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -16,17 +24,20 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
         )
     
     try:
-        username = verify_token(credentials.credentials)
+        with span("jwt"):
+            username = verify_token(credentials.credentials)
         
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, username, is_active FROM users WHERE username = %s",
-            (username,)
-        )
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        user = user_cache.get(username)
+        if user is None:
+            with span("user_db"):
+                async with get_async_db() as conn:
+                    row = await conn.fetchrow(
+                        "SELECT id, username, is_active FROM users WHERE username = $1",
+                        username
+                    )
+            if row:
+                user = {"id": row["id"], "username": row["username"], "is_active": row["is_active"]}
+                user_cache.set(username, user)
         
         if not user:
             raise HTTPException(
@@ -34,15 +45,16 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
                 detail="User not found"
             )
         
-        if not user[2]:
+        if not user["is_active"]:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Inactive user"
             )
-        
-        return {"id": user[0], "username": user[1], "is_active": user[2]}
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
-        )
\ No newline at end of file
+        )
+    
+    record_authenticated_request(username)
+    return dict(user)
@@ -1,5 +1,16 @@
-from prometheus_client import Counter, Histogram, Gauge, generate_latest
-from typing import Literal
+import hashlib
+import os
+import threading
+import time
+from prometheus_client import CollectorRegistry, Counter, Histogram, Gauge, generate_latest, multiprocess
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Literal, Optional, Set, Tuple
+
+from backend.core.config import settings
+
+OTHER_LABEL = "other"
+PENDING_ENDPOINT = "pending"
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
 
 
 http_requests_total = Counter(
@@ -14,10 +25,17 @@ http_request_duration_seconds = Histogram(
     ["method", "endpoint"]
 )
 
+request_stage_duration_seconds = Histogram(
+    "request_stage_duration_seconds",
+    "Time spent in each stage of a sampled request",
+    ["stage"]
+)
+
 active_requests = Gauge(
     "active_requests",
     "Number of active requests",
-    ["endpoint"]
+    ["endpoint"],
+    multiprocess_mode="livesum"
 )
 
 external_api_calls_total = Counter(
@@ -32,6 +50,143 @@ external_api_duration_seconds = Histogram(
     ["service"]
 )
 
+http_client_pool_max_connections = Gauge(
+    "http_client_pool_max_connections",
+    "Maximum connections in the shared HTTP client pool",
+    ["service"],
+    multiprocess_mode="livesum"
+)
+
+http_client_pool_in_use = Gauge(
+    "http_client_pool_in_use",
+    "Requests currently holding a connection from the shared HTTP client pool",
+    ["service"],
+    multiprocess_mode="livesum"
+)
+
+db_pool_connections_in_use = Gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum"
+)
+
+db_pool_connections_idle = Gauge(
+    "db_pool_connections_idle",
+    "Idle database connections held by the pool",
+    multiprocess_mode="livesum"
+)
+
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check out a database connection"
+)
+
+cache_lookups_total = Counter(
+    "cache_lookups_total",
+    "In-process cache lookups",
+    ["cache", "result"]
+)
+
+cache_evictions_total = Counter(
+    "cache_evictions_total",
+    "Entries evicted from an in-process cache to stay within its bounds",
+    ["cache"]
+)
+
+password_hash_queue_depth = Gauge(
+    "password_hash_queue_depth",
+    "Password hashing operations queued or running on the hashing executor",
+    multiprocess_mode="livesum"
+)
+
+password_hash_duration_seconds = Histogram(
+    "password_hash_duration_seconds",
+    "Password hashing latency including executor queueing",
+    ["operation"]
+)
+
+password_hash_rejected_total = Counter(
+    "password_hash_rejected_total",
+    "Password hashing operations rejected because the executor queue was full",
+    ["operation"]
+)
+
+shared_cache_errors_total = Counter(
+    "shared_cache_errors_total",
+    "PostgreSQL shared cache operations that failed and were skipped",
+    ["operation"]
+)
+
+book_catalog_lookups_total = Counter(
+    "book_catalog_lookups_total",
+    "Searches answered from, or passed through, the local book catalog",
+    ["result"]
+)
+
+book_catalog_ingested_total = Counter(
+    "book_catalog_ingested_total",
+    "Books handed to the local catalog ingestion step",
+    ["status"]
+)
+
+book_index_lookups_total = Counter(
+    "book_index_lookups_total",
+    "Searches answered from, or passed through, the in-memory book index",
+    ["result"]
+)
+
+book_index_documents = Gauge(
+    "book_index_documents",
+    "Books held in the in-memory book index",
+    multiprocess_mode="livemax"
+)
+
+book_index_snapshot_errors_total = Counter(
+    "book_index_snapshot_errors_total",
+    "Failed writes of the book index snapshot"
+)
+
+singleflight_coalesced_total = Counter(
+    "singleflight_coalesced_total",
+    "Upstream calls saved by joining an identical in-flight call",
+    ["operation"]
+)
+
+ollama_batch_size = Histogram(
+    "ollama_batch_size",
+    "Descriptions sent to Ollama per keyword extraction batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+
+ollama_batched_items_total = Counter(
+    "ollama_batched_items_total",
+    "Descriptions processed by the Ollama batching scheduler"
+)
+
+ollama_batch_item_latency_seconds = Histogram(
+    "ollama_batch_item_latency_seconds",
+    "Time from submitting a description to the batching scheduler until its keywords are ready"
+)
+
+hedged_requests_total = Counter(
+    "hedged_requests_total",
+    "Hedged external requests by outcome",
+    ["service", "outcome"]
+)
+
+keyword_extractor_wins_total = Counter(
+    "keyword_extractor_wins_total",
+    "Keyword extractions answered by each extractor",
+    ["extractor"]
+)
+
+circuit_breaker_state = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["service"],
+    multiprocess_mode="livemax"
+)
+
 authenticated_requests_total = Counter(
     "authenticated_requests_total",
     "Total authenticated requests",
@@ -47,6 +202,94 @@ def record_request_duration(method: str, endpoint: str, duration: float) -> None
     http_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(duration)
 
 
+def _prefixed_template(path: str, route) -> str:
+    index = 0
+    while index >= 0:
+        if route.path_regex.match(path[index:]):
+            return path[:index] + route.path
+        index = path.find("/", index + 1)
+    return route.path
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return _prefixed_template(scope["path"], route)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._in_flight: Dict[str, Gauge] = {}
+        self._observers: Dict[Tuple[str, str, int], Tuple[Counter, Histogram]] = {}
+        self._static_paths: Set[str] = set()
+    
+    def _in_flight_gauge(self, endpoint: str) -> Gauge:
+        gauge = self._in_flight.get(endpoint)
+        if gauge is None:
+            gauge = self._in_flight[endpoint] = active_requests.labels(endpoint=endpoint)
+        return gauge
+    
+    def _observe(self, method: str, endpoint: str, status: int, duration: float) -> None:
+        key = (method, endpoint, status)
+        observers = self._observers.get(key)
+        if observers is None:
+            observers = self._observers[key] = (
+                http_requests_total.labels(method=method, endpoint=endpoint, status=status),
+                http_request_duration_seconds.labels(method=method, endpoint=endpoint)
+            )
+        observers[0].inc()
+        observers[1].observe(duration)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        path = scope["path"]
+        resolved = path in self._static_paths
+        in_flight = self._in_flight_gauge(path if resolved else PENDING_ENDPOINT)
+        in_flight.inc()
+        
+        def track_in_flight() -> None:
+            nonlocal in_flight, resolved
+            if not resolved and "route" in scope:
+                resolved = True
+                in_flight.dec()
+                in_flight = self._in_flight_gauge(route_template(scope))
+                in_flight.inc()
+        
+        async def receive_tracked() -> Message:
+            track_in_flight()
+            return await receive()
+        
+        async def send_tracked(message: Message) -> None:
+            nonlocal status
+            if not resolved:
+                track_in_flight()
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_tracked, send_tracked)
+        finally:
+            duration = time.perf_counter() - start
+            in_flight.dec()
+            endpoint = route_template(scope)
+            if endpoint == path:
+                self._static_paths.add(path)
+            method = scope["method"] if scope["method"] in HTTP_METHODS else OTHER_LABEL
+            self._observe(method, endpoint, status, duration)
+
+
+def record_stage_duration(stage: str, duration: float) -> None:
+    request_stage_duration_seconds.labels(stage=stage).observe(duration)
+
+
 def record_external_call(service: str, status: Literal["success", "failure"]) -> None:
     external_api_calls_total.labels(service=service, status=status).inc()
 
@@ -55,9 +298,171 @@ def record_external_call_duration(service: str, duration: float) -> None:
     external_api_duration_seconds.labels(service=service).observe(duration)
 
 
+def record_http_client_pool_size(service: str, max_connections: int) -> None:
+    http_client_pool_max_connections.labels(service=service).set(max_connections)
+
+
+def record_http_client_checkout(service: str) -> None:
+    http_client_pool_in_use.labels(service=service).inc()
+
+
+def record_http_client_checkin(service: str) -> None:
+    http_client_pool_in_use.labels(service=service).dec()
+
+
+def record_db_pool_usage(in_use: int, idle: int) -> None:
+    db_pool_connections_in_use.set(in_use)
+    db_pool_connections_idle.set(idle)
+
+
+def record_db_pool_wait(duration: float) -> None:
+    db_pool_wait_seconds.observe(duration)
+
+
+def record_cache_lookup(cache: str, result: Literal["hit", "miss", "stale"]) -> None:
+    cache_lookups_total.labels(cache=cache, result=result).inc()
+
+
+def record_cache_eviction(cache: str) -> None:
+    cache_evictions_total.labels(cache=cache).inc()
+
+
+def record_password_hash_queue_depth(depth: int) -> None:
+    password_hash_queue_depth.set(depth)
+
+
+def record_password_hash_duration(operation: str, duration: float) -> None:
+    password_hash_duration_seconds.labels(operation=operation).observe(duration)
+
+
+def record_password_hash_rejected(operation: str) -> None:
+    password_hash_rejected_total.labels(operation=operation).inc()
+
+
+def record_shared_cache_error(operation: Literal["get", "set", "sweep"]) -> None:
+    shared_cache_errors_total.labels(operation=operation).inc()
+
+
+def record_book_catalog_lookup(result: Literal["hit", "miss", "error"]) -> None:
+    book_catalog_lookups_total.labels(result=result).inc()
+
+
+def record_book_catalog_ingest(status: Literal["stored", "dropped", "failed"], count: int = 1) -> None:
+    book_catalog_ingested_total.labels(status=status).inc(count)
+
+
+def record_book_index_lookup(result: Literal["hit", "miss"]) -> None:
+    book_index_lookups_total.labels(result=result).inc()
+
+
+def record_book_index_size(documents: int) -> None:
+    book_index_documents.set(documents)
+
+
+def record_book_index_snapshot_error() -> None:
+    book_index_snapshot_errors_total.inc()
+
+
+def record_singleflight_coalesced(operation: str) -> None:
+    singleflight_coalesced_total.labels(operation=operation).inc()
+
+
+def record_ollama_batch(size: int) -> None:
+    ollama_batch_size.observe(size)
+    ollama_batched_items_total.inc(size)
+
+
+def record_ollama_batch_item_latency(duration: float) -> None:
+    ollama_batch_item_latency_seconds.observe(duration)
+
+
+def record_hedged_request(service: str, outcome: Literal["fired", "won", "skipped"]) -> None:
+    hedged_requests_total.labels(service=service, outcome=outcome).inc()
+
+
+def record_keyword_extractor_win(extractor: Literal["ollama", "local", "fallback"]) -> None:
+    keyword_extractor_wins_total.labels(extractor=extractor).inc()
+
+
+def record_circuit_breaker_state(service: str, state: Literal["closed", "half_open", "open"]) -> None:
+    circuit_breaker_state.labels(service=service).set({"closed": 0, "half_open": 1, "open": 2}[state])
+
+
+class TopKLabels:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.tracked: Dict[str, int] = {}
+        self.candidates: Dict[str, int] = {}
+        self.exported: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def admit(self, value: str) -> Tuple[str, Optional[str]]:
+        if self.capacity <= 0:
+            return OTHER_LABEL, None
+        with self._lock:
+            if value in self.tracked:
+                self.tracked[value] += 1
+                self.exported[value] += 1
+                return value, None
+            if len(self.tracked) < self.capacity:
+                self.tracked[value] = 1
+                self.exported[value] = 1
+                return value, None
+            
+            if value in self.candidates:
+                self.candidates[value] += 1
+            elif len(self.candidates) < self.capacity:
+                self.candidates[value] = 1
+            else:
+                weakest = min(self.candidates, key=self.candidates.get)
+                self.candidates[value] = self.candidates.pop(weakest) + 1
+            
+            evicted = min(self.tracked, key=self.tracked.get)
+            if self.candidates[value] <= self.tracked[evicted]:
+                return OTHER_LABEL, None
+            
+            del self.tracked[evicted]
+            self.tracked[value] = self.candidates.pop(value)
+            self.exported[value] = 1
+            return value, evicted
+    
+    def release(self, value: str) -> int:
+        with self._lock:
+            return self.exported.pop(value, 0)
+
+
+authenticated_users = TopKLabels(settings.metrics_username_label_limit)
+
+
+def username_bucket(username: str) -> str:
+    digest = hashlib.sha1(username.encode()).digest()
+    return f"user_{int.from_bytes(digest[:8], 'big') % settings.metrics_username_hash_buckets}"
+
+
 def record_authenticated_request(username: str) -> None:
-    authenticated_requests_total.labels(username=username).inc()
+    if multiprocess_enabled():
+        authenticated_requests_total.labels(username=username_bucket(username)).inc()
+        return
+    
+    label, evicted = authenticated_users.admit(username)
+    if evicted is not None:
+        authenticated_requests_total.remove(evicted)
+        authenticated_requests_total.labels(username=OTHER_LABEL).inc(authenticated_users.release(evicted))
+    authenticated_requests_total.labels(username=label).inc()
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def mark_process_dead(pid: int) -> None:
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
 
 
 def get_metrics() -> bytes:
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
     return generate_latest()
\ No newline at end of file
@@ -1,10 +1,72 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Callable, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from backend.core.config import settings
+from backend.core.metrics import (
+    record_password_hash_queue_depth,
+    record_password_hash_duration,
+    record_password_hash_rejected
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+
+class PasswordHasherBusyError(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, executor_type: str, max_workers: int, max_queue: int):
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("forkserver")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+    
+    async def run(self, operation: str, func: Callable, *args):
+        if self._pending >= self.max_queue:
+            record_password_hash_rejected(operation)
+            raise PasswordHasherBusyError("Password hashing is saturated, retry shortly")
+        
+        start = time.time()
+        self._pending += 1
+        record_password_hash_queue_depth(self._pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            record_password_hash_queue_depth(self._pending)
+            record_password_hash_duration(operation, time.time() - start)
+    
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.password_hash_executor,
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue
+)
 
 
 def hash_password(password: str) -> str:
@@ -15,6 +77,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password[:72], hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run("verify", verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expiration_minutes)
@@ -23,4 +93,4 @@ def create_access_token(data: dict) -> str:
 
 
 def decode_access_token(token: str) -> dict:
-    return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
\ No newline at end of file
+    return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
@@ -0,0 +1,61 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.config import settings
+from backend.core.metrics import record_stage_duration
+
+_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_spans", default=None)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((stage, time.perf_counter() - start))
+
+
+def server_timing(spans: List[Tuple[str, float]], total: float) -> bytes:
+    entries = [f"{stage};dur={duration * 1000:.2f}" for stage, duration in spans]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries).encode("latin-1")
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp, sample_rate: Optional[float] = None):
+        self.app = app
+        self.sample_rate = settings.stage_timing_sample_rate if sample_rate is None else sample_rate
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        
+        spans: List[Tuple[str, float]] = []
+        start = time.perf_counter()
+        
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(spans, time.perf_counter() - start)))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        token = _spans.set(spans)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _spans.reset(token)
+            for stage, duration in spans:
+                record_stage_duration(stage, duration)
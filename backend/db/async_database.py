@@ -0,0 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import asyncpg
+
+from backend.core.config import settings
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    settings.database_url,
+                    min_size=settings.async_db_pool_min_size,
+                    max_size=settings.async_db_pool_max_size
+                )
+    return _pool
+
+
+async def close_async_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def get_async_db(transaction: bool = False):
+    pool = await get_async_pool()
+    async with pool.acquire(timeout=settings.db_pool_timeout) as conn:
+        if not transaction:
+            yield conn
+            return
+        async with conn.transaction():
+            yield conn
@@ -1,12 +1,169 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 
 from backend.core.config import settings
+from backend.core.metrics import record_db_pool_usage, record_db_pool_wait
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, dsn: str, min_size: int, max_size: int, timeout: float, health_check: bool = True):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self._idle = deque()
+        self._in_use = set()
+        self._condition = threading.Condition()
+        self._closed = False
+        
+        for _ in range(min_size):
+            self._idle.append(self._connect())
+        self._record_usage()
+    
+    def _connect(self):
+        return psycopg2.connect(self.dsn)
+    
+    def _record_usage(self) -> None:
+        record_db_pool_usage(len(self._in_use), len(self._idle))
+    
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+    
+    def _discard(self, conn) -> None:
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+    
+    def getconn(self, timeout: Optional[float] = None):
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if len(self._in_use) < self.max_size:
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    record_db_pool_wait(time.monotonic() - start)
+                    raise PoolTimeoutError(f"Timed out after {timeout}s waiting for a database connection")
+                self._condition.wait(remaining)
+            
+            placeholder = object()
+            self._in_use.add(placeholder)
+        
+        try:
+            if conn is not None and not self._is_healthy(conn):
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._condition:
+                self._in_use.discard(placeholder)
+                self._condition.notify()
+                self._record_usage()
+            raise
+        
+        with self._condition:
+            self._in_use.discard(placeholder)
+            self._in_use.add(conn)
+            self._record_usage()
+        
+        record_db_pool_wait(time.monotonic() - start)
+        return conn
+    
+    def putconn(self, conn) -> None:
+        with self._condition:
+            self._in_use.discard(conn)
+            if self._closed or conn.closed:
+                self._discard(conn)
+            else:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    try:
+                        conn.rollback()
+                    except psycopg2.Error:
+                        self._discard(conn)
+                        conn = None
+                if conn is not None:
+                    self._idle.append(conn)
+            self._condition.notify()
+            self._record_usage()
+    
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._condition.notify_all()
+            self._record_usage()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    settings.database_url,
+                    min_size=settings.db_pool_min_size,
+                    max_size=settings.db_pool_max_size,
+                    timeout=settings.db_pool_timeout,
+                    health_check=settings.db_pool_health_check
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
 
 def get_connection():
-    return psycopg2.connect(settings.database_url)
+    return get_pool().getconn()
+
+
+def release_connection(conn) -> None:
+    get_pool().putconn(conn)
 
 
 @contextmanager
@@ -19,8 +176,8 @@ def get_db():
         conn.rollback()
         raise
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def get_cursor(conn):
-    return conn.cursor(cursor_factory=RealDictCursor)
\ No newline at end of file
+    return conn.cursor(cursor_factory=RealDictCursor)
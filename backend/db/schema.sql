@@ -6,4 +6,45 @@ CREATE TABLE IF NOT EXISTS users (
     is_active BOOLEAN DEFAULT TRUE
 );
 
-CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+
+CREATE UNLOGGED TABLE IF NOT EXISTS cache_entries (
+    namespace VARCHAR(64) NOT NULL,
+    cache_key TEXT NOT NULL,
+    value JSONB NOT NULL,
+    stored_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (namespace, cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries(expires_at);
+CREATE TABLE IF NOT EXISTS books (
+    id SERIAL PRIMARY KEY,
+    fingerprint VARCHAR(64) UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    authors TEXT[],
+    description TEXT,
+    categories TEXT[],
+    thumbnail TEXT,
+    search_vector TSVECTOR,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_books_search_vector ON books USING GIN (search_vector);
+
+CREATE OR REPLACE FUNCTION books_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.authors, ' '), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.categories, ' '), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS books_search_vector_trigger ON books;
+CREATE TRIGGER books_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON books
+    FOR EACH ROW EXECUTE FUNCTION books_search_vector_update();
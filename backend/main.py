@@ -1,13 +1,68 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.api.routes import health, books, auth
 from backend.core.config import settings
+from backend.core.metrics import MetricsMiddleware, mark_process_dead
+from backend.core.responses import ORJSONResponse
+from backend.core.security import password_hasher
+from backend.core.timing import ServerTimingMiddleware
+from backend.db.database import close_pool
+from backend.db.async_database import close_async_pool
+from backend.services.ollama_service import ollama_service
+from backend.services.google_books_service import google_books_service
+from backend.services.shared_cache import run_sweeper
+from backend.services.book_catalog import book_catalog
+from backend.services.book_index import (
+    book_index,
+    claim_snapshot_writer,
+    release_snapshot_writer,
+    run_snapshots,
+    save_snapshot
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await ollama_service.start()
+    await google_books_service.start()
+    await book_catalog.start()
+    sweeper = None
+    if settings.shared_cache_enabled:
+        sweeper = asyncio.create_task(run_sweeper(settings.shared_cache_sweep_interval))
+    snapshots = None
+    if book_index.enabled and settings.book_index_snapshot_path:
+        book_index.load(settings.book_index_snapshot_path)
+        if claim_snapshot_writer(settings.book_index_snapshot_path):
+            snapshots = asyncio.create_task(
+                run_snapshots(settings.book_index_snapshot_path, settings.book_index_snapshot_interval)
+            )
+    try:
+        yield
+    finally:
+        if sweeper is not None:
+            sweeper.cancel()
+        if snapshots is not None:
+            snapshots.cancel()
+            await save_snapshot(settings.book_index_snapshot_path)
+            release_snapshot_writer()
+        await ollama_service.close()
+        await google_books_service.close()
+        await book_catalog.close()
+        close_pool()
+        await close_async_pool()
+        password_hasher.shutdown()
+        mark_process_dead(os.getpid())
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
-        version=settings.app_version
+        version=settings.app_version,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
     )
     
     app.add_middleware(
@@ -17,6 +72,8 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(MetricsMiddleware)
     
     app.include_router(health.router, tags=["Health"])
     app.include_router(books.router, prefix="/books", tags=["Books"])
@@ -19,6 +19,8 @@ class FailureResponse(BaseModel):
 
 class BookSearchRequest(BaseModel):
     description: str = Field(min_length=3, max_length=500)
+    start_index: int = Field(default=0, ge=0)
+    max_results: int = Field(default=10, ge=1, le=40)
 
 
 class BookResult(BaseModel):
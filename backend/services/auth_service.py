@@ -1,6 +1,25 @@
-from backend.core.security import hash_password, verify_password, create_access_token, decode_access_token
+import hashlib
+import time
+
+from backend.core.cache import TTLCache
+from backend.core.config import settings
+from backend.core.security import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async,
+    create_access_token,
+    decode_access_token
+)
 from jose import JWTError
 
+user_cache = TTLCache("users", maxsize=settings.user_cache_max_size, ttl=settings.user_cache_ttl)
+token_cache = TTLCache("tokens", maxsize=settings.token_cache_max_size, ttl=settings.jwt_expiration_minutes * 60)
+
+
+def invalidate_cached_user(username: str) -> None:
+    user_cache.invalidate(username)
+
 
 def register_user(conn, username: str, password: str) -> dict:
     cursor = conn.cursor()
@@ -17,6 +36,7 @@ def register_user(conn, username: str, password: str) -> dict:
     )
     user = cursor.fetchone()
     cursor.close()
+    invalidate_cached_user(username)
     
     return {"id": user[0], "username": user[1], "is_active": user[2]}
 
@@ -42,16 +62,73 @@ def authenticate_user(conn, username: str, password: str) -> dict:
     return {"id": user[0], "username": user[1], "is_active": user[3]}
 
 
+async def register_user_async(conn, username: str, password: str) -> dict:
+    existing = await conn.fetchval("SELECT id FROM users WHERE username = $1", username)
+    if existing:
+        raise ValueError("Username already exists")
+    
+    hashed_password = await hash_password_async(password)
+    user = await conn.fetchrow(
+        "INSERT INTO users (username, hashed_password) VALUES ($1, $2) RETURNING id, username, is_active",
+        username,
+        hashed_password
+    )
+    invalidate_cached_user(username)
+    
+    return {"id": user["id"], "username": user["username"], "is_active": user["is_active"]}
+
+
+async def authenticate_user_async(conn, username: str, password: str) -> dict:
+    user = await conn.fetchrow(
+        "SELECT id, username, hashed_password, is_active FROM users WHERE username = $1",
+        username
+    )
+    
+    if not user:
+        raise ValueError("Invalid credentials")
+    
+    if not await verify_password_async(password, user["hashed_password"]):
+        raise ValueError("Invalid credentials")
+    
+    if not user["is_active"]:
+        raise ValueError("User is inactive")
+    
+    return {"id": user["id"], "username": user["username"], "is_active": user["is_active"]}
+
+
+def deactivate_user(conn, username: str) -> None:
+    cursor = conn.cursor()
+    cursor.execute("UPDATE users SET is_active = FALSE WHERE username = %s", (username,))
+    cursor.close()
+    invalidate_cached_user(username)
+
+
+async def deactivate_user_async(conn, username: str) -> None:
+    await conn.execute("UPDATE users SET is_active = FALSE WHERE username = $1", username)
+    invalidate_cached_user(username)
+
+
 def generate_token(username: str) -> str:
     return create_access_token({"sub": username})
 
 
 def verify_token(token: str) -> str:
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        username, expires_at = cached
+        if time.time() < expires_at:
+            return username
+        token_cache.invalidate(key)
+    
     try:
         payload = decode_access_token(token)
         username = payload.get("sub")
         if not username:
             raise ValueError("Invalid token")
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)):
+            token_cache.set(key, (username, expires_at), ttl=expires_at - time.time())
         return username
     except JWTError:
         raise ValueError("Invalid token")
\ No newline at end of file
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Optional
+
+from backend.core.config import settings
+from backend.core.metrics import record_book_catalog_lookup, record_book_catalog_ingest
+from backend.db.async_database import get_async_db
+
+SEARCH_QUERY = """
+    SELECT title, authors, description, categories, thumbnail
+    FROM books, websearch_to_tsquery('english', $1) AS query
+    WHERE search_vector @@ query AND ts_rank_cd(search_vector, query) >= $2
+    ORDER BY ts_rank_cd(search_vector, query) DESC
+    LIMIT $3
+"""
+
+UPSERT_QUERY = """
+    INSERT INTO books (fingerprint, title, authors, description, categories, thumbnail)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    ON CONFLICT (fingerprint) DO UPDATE SET
+        description = COALESCE(EXCLUDED.description, books.description),
+        categories = COALESCE(EXCLUDED.categories, books.categories),
+        thumbnail = COALESCE(EXCLUDED.thumbnail, books.thumbnail),
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def book_fingerprint(book: Dict) -> str:
+    authors = ",".join(author.strip().lower() for author in book.get("authors") or [])
+    return hashlib.sha256(f"{book['title'].strip().lower()}|{authors}".encode()).hexdigest()
+
+
+class BookCatalog:
+    def __init__(self):
+        self.enabled = settings.book_catalog_enabled
+        self.min_results = settings.book_catalog_min_results
+        self.min_rank = settings.book_catalog_min_rank
+        self.max_results = settings.book_catalog_max_results
+        self.queue_size = settings.book_catalog_ingest_queue_size
+        self.batch_size = settings.book_catalog_ingest_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        if self.enabled and self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._worker = asyncio.create_task(self._run())
+    
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+            self._queue = None
+    
+    def ingest(self, books: List[Dict]) -> None:
+        if self._queue is None:
+            return
+        for book in books:
+            if not book.get("title"):
+                continue
+            try:
+                self._queue.put_nowait(book)
+            except asyncio.QueueFull:
+                record_book_catalog_ingest("dropped")
+    
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._store(batch)
+    
+    async def _store(self, batch: List[Dict]) -> None:
+        rows = {}
+        for book in batch:
+            rows[book_fingerprint(book)] = (
+                book["title"],
+                book.get("authors"),
+                book.get("description"),
+                book.get("categories"),
+                book.get("thumbnail")
+            )
+        
+        try:
+            async with get_async_db(transaction=True) as conn:
+                await conn.executemany(UPSERT_QUERY, [(fingerprint, *row) for fingerprint, row in rows.items()])
+        except Exception:
+            record_book_catalog_ingest("failed", len(rows))
+            return
+        record_book_catalog_ingest("stored", len(rows))
+    
+    async def search(self, keywords: Dict[str, str]) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        
+        try:
+            async with get_async_db() as conn:
+                rows = await conn.fetch(SEARCH_QUERY, " or ".join(keywords.values()), self.min_rank, self.max_results)
+        except Exception:
+            record_book_catalog_lookup("error")
+            return None
+        
+        if len(rows) < self.min_results:
+            record_book_catalog_lookup("miss")
+            return None
+        
+        record_book_catalog_lookup("hit")
+        return {
+            "total_items": len(rows),
+            "items": [
+                {
+                    "title": row["title"],
+                    "authors": row["authors"],
+                    "description": row["description"],
+                    "categories": row["categories"],
+                    "thumbnail": row["thumbnail"]
+                }
+                for row in rows
+            ]
+        }
+
+
+book_catalog = BookCatalog()
@@ -0,0 +1,308 @@
+import asyncio
+import fcntl
+import json
+import os
+import threading
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.core.config import settings
+from backend.core.metrics import record_book_index_lookup, record_book_index_size, record_book_index_snapshot_error
+from backend.services.book_catalog import book_fingerprint
+from backend.services.keyword_extractor import _WORD, local_keyword_extractor
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+SNAPSHOT_ARRAYS = ("offsets", "docs", "tfs", "lengths")
+WRITER_LOCK = ".writer.lock"
+
+_writer_lock: Optional[int] = None
+_write_lock = threading.Lock()
+
+
+class BookIndex:
+    def __init__(self, stopwords: FrozenSet[str], enabled: Optional[bool] = None):
+        self.stopwords = stopwords
+        self.enabled = settings.book_index_enabled if enabled is None else enabled
+        self.min_results = settings.book_index_min_results
+        self.min_score = settings.book_index_min_score
+        self.max_results = settings.book_index_max_results
+        self.max_documents = settings.book_index_max_documents
+        self._reset()
+    
+    def _reset(self) -> None:
+        self.documents: List[Dict] = []
+        self.fingerprints: Dict[str, int] = {}
+        self.terms: Dict[str, int] = {}
+        self.doc_lengths = array("f")
+        self._total_length = 0.0
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        self._base_docs = np.zeros(0, dtype=np.int32)
+        self._base_tfs = np.zeros(0, dtype=np.float32)
+        self._delta: Dict[int, Tuple[array, array]] = {}
+        self.dirty = False
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def tokenize(self, text: Optional[str]) -> List[str]:
+        if not text:
+            return []
+        return [word for word in _WORD.findall(text.lower()) if word not in self.stopwords]
+    
+    def add(self, book: Dict) -> bool:
+        if not book.get("title") or len(self.documents) >= self.max_documents:
+            return False
+        fingerprint = book_fingerprint(book)
+        if fingerprint in self.fingerprints:
+            return False
+        
+        tokens = self.tokenize(book["title"]) * TITLE_WEIGHT
+        tokens += self.tokenize(" ".join(book.get("authors") or []))
+        tokens += self.tokenize(" ".join(book.get("categories") or []))
+        tokens += self.tokenize(book.get("description"))
+        
+        doc_id = len(self.documents)
+        for term, tf in Counter(tokens).items():
+            term_id = self.terms.setdefault(term, len(self.terms))
+            docs, tfs = self._delta.setdefault(term_id, (array("i"), array("f")))
+            docs.append(doc_id)
+            tfs.append(tf)
+        
+        self.documents.append({
+            "title": book["title"],
+            "authors": book.get("authors"),
+            "description": book.get("description"),
+            "categories": book.get("categories"),
+            "thumbnail": book.get("thumbnail")
+        })
+        self.fingerprints[fingerprint] = doc_id
+        self.doc_lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        self.dirty = True
+        return True
+    
+    def add_many(self, books: Iterable[Dict]) -> int:
+        if not self.enabled:
+            return 0
+        added = sum(self.add(book) for book in books)
+        if added:
+            record_book_index_size(len(self.documents))
+        return added
+    
+    def _postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        return merged_postings(self._base_offsets, self._base_docs, self._base_tfs, self._delta, term_id)
+    
+    def score(self, query_terms: Iterable[str]) -> np.ndarray:
+        count = len(self.documents)
+        scores = np.zeros(count, dtype=np.float32)
+        if not count:
+            return scores
+        
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.float32)
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths / (self._total_length / count))
+        
+        for term in set(query_terms):
+            term_id = self.terms.get(term)
+            if term_id is None:
+                continue
+            docs, tfs = self._postings(term_id)
+            idf = np.log1p((count - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (BM25_K1 + 1.0) / (tfs + norm[docs])
+        return scores
+    
+    def search(self, keywords: Dict[str, str]) -> Optional[Dict]:
+        if not self.enabled or not self.documents:
+            return None
+        
+        scores = self.score(self.tokenize(" ".join(keywords.values())))
+        matches = np.flatnonzero(scores >= self.min_score)
+        if len(matches) < self.min_results:
+            record_book_index_lookup("miss")
+            return None
+        
+        record_book_index_lookup("hit")
+        top = matches[np.argsort(-scores[matches], kind="stable")[:self.max_results]]
+        return {
+            "total_items": len(matches),
+            "items": [dict(self.documents[doc_id]) for doc_id in top]
+        }
+    
+    def freeze(self) -> Tuple:
+        delta = {term_id: (docs[:], tfs[:]) for term_id, (docs, tfs) in self._delta.items()}
+        self.dirty = False
+        return (
+            self._base_offsets,
+            self._base_docs,
+            self._base_tfs,
+            delta,
+            list(self.terms),
+            list(self.documents),
+            self.doc_lengths[:]
+        )
+    
+    def adopt(self, view: Tuple, arrays: Dict[str, np.ndarray]) -> None:
+        self._base_offsets = arrays["offsets"]
+        self._base_docs = arrays["docs"]
+        self._base_tfs = arrays["tfs"]
+        for term_id, (frozen_docs, frozen_tfs) in view[3].items():
+            docs, tfs = self._delta[term_id]
+            if len(docs) == len(frozen_docs):
+                del self._delta[term_id]
+            else:
+                self._delta[term_id] = (docs[len(frozen_docs):], tfs[len(frozen_tfs):])
+    
+    def snapshot(self) -> Tuple[Dict[str, np.ndarray], Dict]:
+        view = self.freeze()
+        arrays, meta = compact_snapshot(view)
+        self.adopt(view, arrays)
+        return arrays, meta
+    
+    def load(self, path: str) -> bool:
+        directory = Path(path)
+        try:
+            with open(directory / "index.json", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in SNAPSHOT_ARRAYS}
+        except (OSError, ValueError):
+            return False
+        
+        terms, documents = meta["terms"], meta["documents"]
+        if (
+            len(arrays["offsets"]) != len(terms) + 1
+            or arrays["offsets"][-1] != len(arrays["docs"])
+            or len(arrays["tfs"]) != len(arrays["docs"])
+            or len(arrays["lengths"]) != len(documents)
+        ):
+            return False
+        
+        self._reset()
+        self._base_offsets = arrays["offsets"]
+        self._base_docs = arrays["docs"]
+        self._base_tfs = arrays["tfs"]
+        self.terms = {term: term_id for term_id, term in enumerate(terms)}
+        self.documents = documents
+        self.fingerprints = {book_fingerprint(book): doc_id for doc_id, book in enumerate(documents)}
+        self.doc_lengths = array("f", arrays["lengths"])
+        self._total_length = float(sum(self.doc_lengths))
+        record_book_index_size(len(self.documents))
+        return True
+
+
+def merged_postings(
+    base_offsets: np.ndarray,
+    base_docs: np.ndarray,
+    base_tfs: np.ndarray,
+    delta: Dict[int, Tuple[array, array]],
+    term_id: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    docs = base_docs[0:0]
+    tfs = base_tfs[0:0]
+    if term_id < len(base_offsets) - 1:
+        start, end = base_offsets[term_id], base_offsets[term_id + 1]
+        docs, tfs = base_docs[start:end], base_tfs[start:end]
+    
+    postings = delta.get(term_id)
+    if postings is not None:
+        docs = np.concatenate([docs, np.frombuffer(postings[0], dtype=np.int32)])
+        tfs = np.concatenate([tfs, np.frombuffer(postings[1], dtype=np.float32)])
+    return docs, tfs
+
+
+def compact_snapshot(view: Tuple) -> Tuple[Dict[str, np.ndarray], Dict]:
+    base_offsets, base_docs, base_tfs, delta, terms, documents, lengths = view
+    docs, tfs, offsets = [], [], [0]
+    for term_id in range(len(terms)):
+        term_docs, term_tfs = merged_postings(base_offsets, base_docs, base_tfs, delta, term_id)
+        docs.append(term_docs)
+        tfs.append(term_tfs)
+        offsets.append(offsets[-1] + len(term_docs))
+    
+    arrays = {
+        "offsets": np.array(offsets, dtype=np.int64),
+        "docs": np.concatenate(docs).astype(np.int32) if docs else np.zeros(0, dtype=np.int32),
+        "tfs": np.concatenate(tfs).astype(np.float32) if tfs else np.zeros(0, dtype=np.float32),
+        "lengths": np.array(lengths, dtype=np.float32)
+    }
+    return arrays, {"terms": terms, "documents": documents}
+
+
+def write_snapshot(path: str, arrays: Dict[str, np.ndarray], meta: Dict) -> None:
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = f".{os.getpid()}.tmp"
+    for name, values in arrays.items():
+        temporary = directory / f"{name}.npy{suffix}"
+        with open(temporary, "wb") as handle:
+            np.save(handle, values)
+        os.replace(temporary, directory / f"{name}.npy")
+    
+    temporary = directory / f"index.json{suffix}"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        json.dump(meta, handle)
+    os.replace(temporary, directory / "index.json")
+
+
+def claim_snapshot_writer(path: str) -> bool:
+    global _writer_lock
+    if _writer_lock is not None:
+        return True
+    directory = Path(path)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        descriptor = os.open(directory / WRITER_LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(descriptor)
+        return False
+    _writer_lock = descriptor
+    return True
+
+
+def release_snapshot_writer() -> None:
+    global _writer_lock
+    if _writer_lock is not None:
+        os.close(_writer_lock)
+        _writer_lock = None
+
+
+def _compact_and_write(path: str, view: Tuple) -> Dict[str, np.ndarray]:
+    arrays, meta = compact_snapshot(view)
+    with _write_lock:
+        write_snapshot(path, arrays, meta)
+    return arrays
+
+
+async def save_snapshot(path: str) -> bool:
+    if not book_index.dirty:
+        return False
+    view = book_index.freeze()
+    try:
+        arrays = await asyncio.to_thread(_compact_and_write, path, view)
+    except OSError:
+        book_index.dirty = True
+        record_book_index_snapshot_error()
+        return False
+    except asyncio.CancelledError:
+        book_index.dirty = True
+        raise
+    book_index.adopt(view, arrays)
+    return True
+
+
+async def run_snapshots(path: str, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await save_snapshot(path)
+
+
+book_index = BookIndex(local_keyword_extractor.stopwords)
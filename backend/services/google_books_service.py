@@ -1,60 +1,257 @@
+import asyncio
+import json
 import time
 import httpx
-from typing import Dict
-from backend.core.metrics import record_external_call, record_external_call_duration
+from urllib.parse import urlencode
+from typing import Dict, Optional, Set, Tuple
+from backend.core.cache import TTLCache
+from backend.core.circuit_breaker import CircuitBreaker
+from backend.core.config import settings
+from backend.core.singleflight import SingleFlight
+from backend.services.book_catalog import book_catalog
+from backend.services.shared_cache import SharedCache
+from backend.core.metrics import (
+    record_external_call,
+    record_external_call_duration,
+    record_http_client_pool_size,
+    record_http_client_checkout,
+    record_http_client_checkin,
+    record_hedged_request
+)
+
+HEDGE_TOKEN_CAP = 10.0
+VOLUME_FIELDS = "totalItems,items(volumeInfo(title,authors,description,categories,imageLinks/thumbnail))"
+
+
+class ResponseTooLargeError(Exception):
+    pass
+
+
+def canonical_query(keywords: Dict[str, str]) -> str:
+    return "+".join(value.strip().lower() for value in keywords.values())
 
 
 class GoogleBooksService:
     def __init__(self):
-        self.base_url = "https://www.googleapis.com/books/v1/volumes"
-        self.timeout = 10.0
+        self.base_url = settings.google_books_base_url
+        self.timeout = settings.google_books_timeout
+        self.client: Optional[httpx.AsyncClient] = None
+        self.stale_ttl = settings.google_books_cache_stale_ttl
+        self.cache = SharedCache("google_books", TTLCache(
+            "google_books",
+            maxsize=settings.google_books_cache_max_size,
+            ttl=settings.google_books_cache_ttl,
+            stale_ttl=max(settings.google_books_cache_stale_ttl, settings.google_books_cache_stale_if_error_ttl)
+        ))
+        self.flights = SingleFlight("google_books")
+        self.breaker = CircuitBreaker(
+            "google_books",
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            slow_call_threshold=settings.google_books_slow_call_threshold,
+            reset_timeout=settings.circuit_breaker_reset_timeout,
+            half_open_max_calls=settings.circuit_breaker_half_open_max_calls
+        )
+        self.max_response_bytes = settings.google_books_max_response_bytes
+        self.prefetch_next_page = settings.google_books_prefetch_next_page
+        self.hedge_delay = settings.google_books_hedge_delay
+        self.hedge_budget = settings.google_books_hedge_budget_percent / 100
+        self._hedge_tokens = 0.0
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
     
-    async def search_books(self, keywords: Dict[str, str]) -> Dict:
-        start = time.time()
-        query = "+".join(keywords.values())
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=settings.google_books_http2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.google_books_max_connections,
+                    max_keepalive_connections=settings.google_books_max_keepalive_connections,
+                    keepalive_expiry=settings.google_books_keepalive_expiry
+                )
+            )
+            record_http_client_pool_size("google_books", settings.google_books_max_connections)
+        return self.client
+    
+    async def start(self) -> None:
+        self._get_client()
+    
+    async def close(self) -> None:
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+    
+    async def search_books(self, keywords: Dict[str, str], start_index: int = 0, max_results: int = 10) -> Dict:
+        key, params = self._page_params(keywords, start_index, max_results)
+        result = await self._search(key, params)
+        
+        next_index = start_index + max_results
+        if self.prefetch_next_page and next_index < result["total_items"]:
+            next_key, next_params = self._page_params(keywords, next_index, max_results)
+            if next_key not in self.cache.local:
+                self._schedule_refresh(next_key, next_params)
+        return result
+    
+    def is_cached(self, keywords: Dict[str, str], start_index: int = 0, max_results: int = 10) -> bool:
+        key, _ = self._page_params(keywords, start_index, max_results)
+        return key in self.cache.local
+    
+    def _page_params(self, keywords: Dict[str, str], start_index: int, max_results: int) -> Tuple[str, Dict]:
+        params = {
+            "q": canonical_query(keywords),
+            "startIndex": start_index,
+            "maxResults": max_results,
+            "printType": "books",
+            "fields": VOLUME_FIELDS
+        }
+        return urlencode(sorted(params.items())), params
+    
+    async def _search(self, key: str, params: Dict) -> Dict:
+        cached = await self.cache.get_stale(key)
+        if cached is None:
+            return await self._fetch(key, params)
+        
+        result, age = cached
+        if age < self.cache.ttl:
+            return result
+        if age < self.cache.ttl + self.stale_ttl:
+            self._schedule_refresh(key, params)
+            return result
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.base_url,
-                    params={
-                        "q": query,
-                        "maxResults": 10,
-                        "printType": "books"
-                    },
-                    timeout=self.timeout
-                )
+            return await self._fetch(key, params)
+        except Exception:
+            return result
+    
+    def _schedule_refresh(self, key: str, params: Dict) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, params))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def _refresh(self, key: str, params: Dict) -> None:
+        try:
+            await self._fetch(key, params)
+        except Exception:
+            pass
+        finally:
+            self._refreshing.discard(key)
+    
+    async def _fetch(self, key: str, params: Dict) -> Dict:
+        return await self.flights.do(key, lambda: self._load(key, params))
+    
+    async def _load(self, key: str, params: Dict) -> Dict:
+        result = await self.breaker.call(lambda: self._request(params))
+        self.cache.set(key, result)
+        book_catalog.ingest(result["items"])
+        return result
+    
+    def _take_hedge_token(self) -> bool:
+        if self._hedge_tokens >= 1:
+            self._hedge_tokens -= 1
+            return True
+        return False
+    
+    async def _send(self, params: Dict) -> bytes:
+        if self.hedge_delay <= 0:
+            return await self._get(params)
+        
+        self._hedge_tokens = min(self._hedge_tokens + self.hedge_budget, HEDGE_TOKEN_CAP)
+        primary = asyncio.ensure_future(self._get(params))
+        attempts = {primary}
+        
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=self.hedge_delay)
+            if done:
+                return primary.result()
+            if not self._take_hedge_token():
+                record_hedged_request("google_books", "skipped")
+                return await primary
+            
+            record_hedged_request("google_books", "fired")
+            hedge = asyncio.ensure_future(self._get(params))
+            attempts.add(hedge)
+            
+            failures = []
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is hedge:
+                            record_hedged_request("google_books", "won")
+                        return attempt.result()
+                    failures.append(attempt.exception())
+            raise failures[0]
+        finally:
+            for attempt in (primary, *attempts):
+                if not attempt.done():
+                    attempt.cancel()
+                elif not attempt.cancelled():
+                    attempt.exception()
+    
+    async def _get(self, params: Dict) -> bytes:
+        client = self._get_client()
+        record_http_client_checkout("google_books")
+        try:
+            async with client.stream(
+                "GET",
+                self.base_url,
+                params=params,
+                timeout=self.timeout
+            ) as response:
                 response.raise_for_status()
+                return await self._read_body(response)
+        finally:
+            record_http_client_checkin("google_books")
+    
+    async def _read_body(self, response: httpx.Response) -> bytes:
+        if int(response.headers.get("content-length", 0)) > self.max_response_bytes:
+            raise ResponseTooLargeError(f"Google Books response exceeds {self.max_response_bytes} bytes")
+        
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > self.max_response_bytes:
+                raise ResponseTooLargeError(f"Google Books response exceeds {self.max_response_bytes} bytes")
+        return bytes(body)
+    
+    async def _request(self, params: Dict) -> Dict:
+        start = time.time()
+        
+        try:
+            data = json.loads(await self._send(params))
+            total_items = data.get("totalItems", 0)
+            items = data.get("items", [])
+            
+            books = []
+            for item in items:
+                volume_info = item.get("volumeInfo", {})
+                image_links = volume_info.get("imageLinks", {}) or {}
                 
-                data = response.json()
-                total_items = data.get("totalItems", 0)
-                items = data.get("items", [])
-                
-                books = []
-                for item in items:
-                    volume_info = item.get("volumeInfo", {})
-                    image_links = volume_info.get("imageLinks", {}) or {}
-                    
-                    books.append({
-                        "title": volume_info.get("title"),
-                        "authors": volume_info.get("authors"),
-                        "description": volume_info.get("description"),
-                        "categories": volume_info.get("categories"),
-                        "thumbnail": image_links.get("thumbnail")
-                    })
-                
-                record_external_call("google_books", "success")
-                record_external_call_duration("google_books", time.time() - start)
-                
-                return {
-                    "total_items": total_items,
-                    "items": books
-                }
+                books.append({
+                    "title": volume_info.get("title"),
+                    "authors": volume_info.get("authors"),
+                    "description": volume_info.get("description"),
+                    "categories": volume_info.get("categories"),
+                    "thumbnail": image_links.get("thumbnail")
+                })
+            
+            record_external_call("google_books", "success")
+            record_external_call_duration("google_books", time.time() - start)
+            
+            return {
+                "total_items": total_items,
+                "items": books
+            }
         
-        except Exception as e:
+        except Exception:
             record_external_call("google_books", "failure")
             record_external_call_duration("google_books", time.time() - start)
             raise
 
 
-google_books_service = GoogleBooksService()
\ No newline at end of file
+google_books_service = GoogleBooksService()
@@ -0,0 +1,79 @@
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, List
+
+import numpy as np
+
+DATA_DIR = Path(__file__).parent / "data"
+FALLBACK_WORDS = ("fiction", "novel", "book")
+
+_WORD = re.compile(r"[a-z][a-z'\-]*[a-z]")
+_PHRASE_BREAK = re.compile(r"[.,;:!?()\[\]\"\n]+")
+
+
+def _load_words(filename: str) -> List[str]:
+    with open(DATA_DIR / filename, encoding="utf-8") as handle:
+        return [line.strip() for line in handle if line.strip()]
+
+
+class LocalKeywordExtractor:
+    def __init__(self, stopwords: FrozenSet[str], common_words: List[str]):
+        self.stopwords = stopwords
+        self.common_rank = {word: rank for rank, word in enumerate(common_words)}
+        self._max_rank = np.log1p(len(common_words) + 1)
+    
+    def _phrases(self, description: str) -> List[List[str]]:
+        phrases = []
+        for fragment in _PHRASE_BREAK.split(description.lower()):
+            phrase = []
+            for word in _WORD.findall(fragment):
+                if word in self.stopwords or len(word) < 3:
+                    if phrase:
+                        phrases.append(phrase)
+                        phrase = []
+                else:
+                    phrase.append(word)
+            if phrase:
+                phrases.append(phrase)
+        return phrases
+    
+    def extract(self, description: str, count: int = 3) -> List[str]:
+        phrases = self._phrases(description)
+        if not phrases:
+            return []
+        
+        words = [word for phrase in phrases for word in phrase]
+        terms, first_seen, inverse, frequency = np.unique(
+            np.array(words), return_index=True, return_inverse=True, return_counts=True
+        )
+        
+        lengths = np.repeat([len(phrase) for phrase in phrases], [len(phrase) for phrase in phrases])
+        degree = np.bincount(inverse, weights=lengths, minlength=len(terms))
+        
+        ranks = np.array([self.common_rank.get(term, -1) for term in terms], dtype=float)
+        rarity = np.where(ranks < 0, 1.0, np.log1p(ranks + 1) / self._max_rank * 0.5)
+        
+        position = 1.0 - first_seen / (len(words) + 1)
+        scores = (frequency / len(words)) * rarity * (1.0 + degree / frequency) + 0.01 * position
+        
+        order = np.lexsort((first_seen, -scores))
+        return [str(term) for term in terms[order[:count]]]
+    
+    def extract_keywords(self, description: str) -> Dict[str, str]:
+        keywords = self.extract(description)
+        for word in FALLBACK_WORDS:
+            if len(keywords) >= 3:
+                break
+            if word not in keywords:
+                keywords.append(word)
+        return {
+            "keyword_1": keywords[0],
+            "keyword_2": keywords[1],
+            "keyword_3": keywords[2]
+        }
+
+
+local_keyword_extractor = LocalKeywordExtractor(
+    frozenset(_load_words("stopwords.txt")),
+    _load_words("common_words.txt")
+)
@@ -1,8 +1,144 @@
+import asyncio
+import json
+import re
 import time
 import httpx
-from typing import Dict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from backend.core.cache import TTLCache
+from backend.core.circuit_breaker import CircuitBreaker
 from backend.core.config import settings
-from backend.core.metrics import record_external_call, record_external_call_duration
+from backend.core.singleflight import SingleFlight
+from backend.core.metrics import (
+    record_external_call,
+    record_external_call_duration,
+    record_http_client_pool_size,
+    record_http_client_checkout,
+    record_http_client_checkin,
+    record_ollama_batch,
+    record_ollama_batch_item_latency,
+    record_keyword_extractor_win
+)
+from backend.services.keyword_extractor import local_keyword_extractor
+from backend.services.shared_cache import SharedCache
+
+FALLBACK_KEYWORDS = {
+    "keyword_1": "fiction",
+    "keyword_2": "novel",
+    "keyword_3": "book"
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[.:)\-]\s*(.*)$")
+
+
+def normalize_description(description: str) -> str:
+    return " ".join(_PUNCTUATION.sub(" ", description.lower()).split())
+
+
+def parse_keywords(text: str) -> Dict[str, str]:
+    keywords_list = text.strip().split()[:3]
+    
+    while len(keywords_list) < 3:
+        keywords_list.append("book")
+    
+    return {
+        "keyword_1": keywords_list[0],
+        "keyword_2": keywords_list[1],
+        "keyword_3": keywords_list[2]
+    }
+
+
+def parse_numbered_keywords(text: str, count: int) -> List[Optional[Dict[str, str]]]:
+    results: List[Optional[Dict[str, str]]] = [None] * count
+    for line in text.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        if 0 <= index < count and results[index] is None and match.group(2).strip():
+            results[index] = parse_keywords(match.group(2))
+    return results
+
+
+def _consume_result(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+def _keywords_size(key: str, keywords: Dict[str, str]) -> int:
+    return len(key) + sum(len(name) + len(value) for name, value in keywords.items())
+
+
+class KeywordBatcher:
+    def __init__(self, service: "OllamaService", window: float, max_size: int, mode: str, max_parallel: int):
+        self.service = service
+        self.window = window
+        self.max_size = max_size
+        self.mode = mode
+        self.max_parallel = max_parallel
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_size > 1
+    
+    async def submit(self, description: str) -> Dict[str, str]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((description, future, time.time()))
+        
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        record_ollama_batch(len(batch))
+        descriptions = [description for description, _, _ in batch]
+        
+        if self.mode == "prompt" and len(batch) > 1:
+            try:
+                results = await self.service._generate_keywords_batch(descriptions)
+            except Exception:
+                results = [None] * len(batch)
+            missing = [index for index, result in enumerate(results) if result is None]
+        else:
+            results = [None] * len(batch)
+            missing = list(range(len(batch)))
+        
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        
+        async def generate_one(index: int):
+            async with semaphore:
+                return await self.service._generate_keywords(descriptions[index])
+        
+        singles = await asyncio.gather(*[generate_one(index) for index in missing], return_exceptions=True)
+        for index, result in zip(missing, singles):
+            results[index] = result
+        
+        for (_, future, submitted_at), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+            record_ollama_batch_item_latency(time.time() - submitted_at)
 
 
 class OllamaService:
@@ -10,13 +146,128 @@ class OllamaService:
         self.base_url = settings.ollama_base_url
         self.model = settings.ollama_model
         self.timeout = settings.ollama_timeout
+        self.local_extractor_enabled = settings.local_keyword_extractor_enabled
+        self.deadline = settings.keyword_extraction_deadline
+        self.client: Optional[httpx.AsyncClient] = None
+        self.cache = SharedCache("keywords", TTLCache(
+            "keywords",
+            maxsize=settings.keyword_cache_max_size,
+            ttl=settings.keyword_cache_ttl,
+            max_bytes=settings.keyword_cache_max_bytes,
+            sizeof=_keywords_size
+        ))
+        self.flights = SingleFlight("ollama")
+        self.breaker = CircuitBreaker(
+            "ollama",
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            slow_call_threshold=settings.ollama_slow_call_threshold,
+            reset_timeout=settings.circuit_breaker_reset_timeout,
+            half_open_max_calls=settings.circuit_breaker_half_open_max_calls
+        )
+        self.batcher = KeywordBatcher(
+            self,
+            window=settings.ollama_batch_window,
+            max_size=settings.ollama_batch_max_size,
+            mode=settings.ollama_batch_mode,
+            max_parallel=settings.ollama_batch_max_parallel
+        )
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.ollama_max_connections,
+                    max_keepalive_connections=settings.ollama_max_keepalive_connections,
+                    keepalive_expiry=settings.ollama_keepalive_expiry
+                )
+            )
+            record_http_client_pool_size("ollama", settings.ollama_max_connections)
+        return self.client
+    
+    async def start(self) -> None:
+        self._get_client()
+    
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
     
     async def extract_keywords(self, description: str) -> Dict[str, str]:
+        return await self._extract(description, self._load_keywords)
+    
+    async def extract_keywords_streaming(self, description: str) -> Dict[str, str]:
+        return await self._extract(description, self._load_keywords_streaming)
+    
+    async def _extract(self, description: str, load: Callable[[str, str], Awaitable[Dict[str, str]]]) -> Dict[str, str]:
+        key = normalize_description(description)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        if self.breaker.is_open:
+            return self._fallback_keywords(description)
+        
+        pending = asyncio.ensure_future(self.flights.do(key, lambda: load(key, description)))
+        pending.add_done_callback(_consume_result)
+        try:
+            if self.local_extractor_enabled:
+                keywords = await asyncio.wait_for(asyncio.shield(pending), timeout=self.deadline)
+            else:
+                keywords = await pending
+        except Exception:
+            return self._fallback_keywords(description)
+        
+        record_keyword_extractor_win("ollama")
+        return dict(keywords)
+    
+    def _fallback_keywords(self, description: str) -> Dict[str, str]:
+        if self.local_extractor_enabled:
+            record_keyword_extractor_win("local")
+            return local_keyword_extractor.extract_keywords(description)
+        record_keyword_extractor_win("fallback")
+        return dict(FALLBACK_KEYWORDS)
+    
+    async def _load_keywords_streaming(self, key: str, description: str) -> Dict[str, str]:
+        keywords = parse_keywords(await self._generate_streaming(self._keywords_prompt(description)))
+        self.cache.set(key, keywords)
+        return keywords
+    
+    async def _load_keywords(self, key: str, description: str) -> Dict[str, str]:
+        if self.batcher.enabled:
+            keywords = await self.batcher.submit(description)
+        else:
+            keywords = await self._generate_keywords(description)
+        self.cache.set(key, keywords)
+        return keywords
+    
+    def _keywords_prompt(self, description: str) -> str:
+        return f"Extract exactly 3 keywords from this book description: {description}. Return only 3 words separated by spaces."
+    
+    async def _generate_keywords(self, description: str) -> Dict[str, str]:
+        return parse_keywords(await self._generate(self._keywords_prompt(description)))
+    
+    async def _generate_keywords_batch(self, descriptions: List[str]) -> List[Optional[Dict[str, str]]]:
+        numbered = "\n".join(f"{index}. {description}" for index, description in enumerate(descriptions, start=1))
+        prompt = (
+            "Extract exactly 3 keywords from each of the following book descriptions. "
+            "Answer with one line per description in the form '<number>: word word word' and nothing else.\n"
+            f"{numbered}"
+        )
+        return parse_numbered_keywords(await self._generate(prompt), len(descriptions))
+    
+    async def _generate(self, prompt: str) -> str:
+        return await self.breaker.call(lambda: self._post_generate(prompt))
+    
+    async def _generate_streaming(self, prompt: str) -> str:
+        return await self.breaker.call(lambda: self._stream_generate(prompt))
+    
+    async def _post_generate(self, prompt: str) -> str:
         start = time.time()
-        prompt = f"Extract exactly 3 keywords from this book description: {description}. Return only 3 words separated by spaces."
         
         try:
-            async with httpx.AsyncClient() as client:
+            client = self._get_client()
+            record_http_client_checkout("ollama")
+            try:
                 response = await client.post(
                     f"{self.base_url}/api/generate",
                     json={
@@ -26,33 +277,62 @@ class OllamaService:
                     },
                     timeout=self.timeout
                 )
-                response.raise_for_status()
-                
-                data = response.json()
-                keywords_text = data.get("response", "").strip()
-                keywords_list = keywords_text.split()[:3]
-                
-                while len(keywords_list) < 3:
-                    keywords_list.append("book")
-                
-                record_external_call("ollama", "success")
-                record_external_call_duration("ollama", time.time() - start)
-                
-                return {
-                    "keyword_1": keywords_list[0],
-                    "keyword_2": keywords_list[1],
-                    "keyword_3": keywords_list[2]
-                }
-        
-        except Exception as e:
+            finally:
+                record_http_client_checkin("ollama")
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            record_external_call("ollama", "success")
+            record_external_call_duration("ollama", time.time() - start)
+            
+            return data.get("response", "")
+        
+        except Exception:
             record_external_call("ollama", "failure")
             record_external_call_duration("ollama", time.time() - start)
+            raise
+
+    
+    async def _stream_generate(self, prompt: str) -> str:
+        start = time.time()
+        text = ""
+        
+        try:
+            client = self._get_client()
+            record_http_client_checkout("ollama")
+            try:
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/api/generate",
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "stream": True
+                    },
+                    timeout=self.timeout
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        text += chunk.get("response", "")
+                        words = text.split()
+                        if chunk.get("done") or len(words) > 3 or (len(words) == 3 and text[-1].isspace()):
+                            break
+            finally:
+                record_http_client_checkin("ollama")
+            
+            record_external_call("ollama", "success")
+            record_external_call_duration("ollama", time.time() - start)
             
-            return {
-                "keyword_1": "fiction",
-                "keyword_2": "novel",
-                "keyword_3": "book"
-            }
+            return text
+        
+        except Exception:
+            record_external_call("ollama", "failure")
+            record_external_call_duration("ollama", time.time() - start)
+            raise
 
 
-ollama_service = OllamaService()
\ No newline at end of file
+ollama_service = OllamaService()
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from typing import Any, Optional, Set, Tuple
+
+from backend.core.cache import TTLCache
+from backend.core.config import settings
+from backend.core.metrics import record_cache_lookup, record_shared_cache_error
+from backend.db.async_database import get_async_db
+
+
+class SharedCache:
+    def __init__(self, namespace: str, local: TTLCache, enabled: Optional[bool] = None):
+        self.namespace = namespace
+        self.local = local
+        self.enabled = settings.shared_cache_enabled if enabled is None else enabled
+        self._writes: Set[asyncio.Task] = set()
+    
+    @property
+    def ttl(self) -> float:
+        return self.local.ttl
+    
+    @property
+    def stale_ttl(self) -> float:
+        return self.local.stale_ttl
+    
+    async def get(self, key: str) -> Any:
+        found = await self.get_stale(key)
+        if found is None or found[1] >= self.local.ttl:
+            return None
+        return found[0]
+    
+    async def get_stale(self, key: str) -> Optional[Tuple[Any, float]]:
+        found = self.local.get_stale(key)
+        if found is not None or not self.enabled:
+            return found
+        
+        try:
+            async with get_async_db() as conn:
+                row = await conn.fetchrow(
+                    "SELECT value, EXTRACT(EPOCH FROM now() - stored_at) AS age FROM cache_entries "
+                    "WHERE namespace = $1 AND cache_key = $2 AND expires_at > now()",
+                    self.namespace,
+                    key
+                )
+        except Exception:
+            record_shared_cache_error("get")
+            return None
+        
+        if row is None:
+            record_cache_lookup(f"shared_{self.namespace}", "miss")
+            return None
+        
+        value, age = json.loads(row["value"]), max(float(row["age"]), 0.0)
+        record_cache_lookup(f"shared_{self.namespace}", "hit" if age < self.local.ttl else "stale")
+        self.local.set(key, value, age=age)
+        return value, age
+    
+    def set(self, key: str, value: Any) -> None:
+        self.local.set(key, value)
+        if not self.enabled:
+            return
+        task = asyncio.ensure_future(self._write(key, value))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+    
+    async def _write(self, key: str, value: Any) -> None:
+        try:
+            async with get_async_db() as conn:
+                await conn.execute(
+                    "INSERT INTO cache_entries (namespace, cache_key, value, stored_at, expires_at) "
+                    "VALUES ($1, $2, $3, now(), now() + make_interval(secs => $4)) "
+                    "ON CONFLICT (namespace, cache_key) DO UPDATE "
+                    "SET value = EXCLUDED.value, stored_at = EXCLUDED.stored_at, expires_at = EXCLUDED.expires_at",
+                    self.namespace,
+                    key,
+                    json.dumps(value),
+                    self.local.ttl + self.local.stale_ttl
+                )
+        except Exception:
+            record_shared_cache_error("set")
+    
+    def clear(self) -> None:
+        self.local.clear()
+
+
+async def sweep_expired_entries() -> int:
+    async with get_async_db() as conn:
+        status = await conn.execute("DELETE FROM cache_entries WHERE expires_at <= now()")
+    return int(status.split()[-1])
+
+
+async def run_sweeper(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sweep_expired_entries()
+        except Exception:
+            record_shared_cache_error("sweep")
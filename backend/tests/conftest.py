@@ -1,6 +1,8 @@
 import pytest
 from prometheus_client import REGISTRY
 
+from backend.services.auth_service import user_cache, token_cache
+
 @pytest.fixture(autouse=True)
 def reset_metrics():
     collectors = list(REGISTRY._collector_to_names.keys())
@@ -8,4 +10,13 @@ def reset_metrics():
         try:
             REGISTRY.unregister(collector)
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    user_cache.clear()
+    token_cache.clear()
+    yield
+    user_cache.clear()
+    token_cache.clear()
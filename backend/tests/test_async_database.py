@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.db import async_database
+
+
+@pytest.fixture
+def mock_pool():
+    pool = MagicMock()
+    pool.close = AsyncMock()
+    with patch("backend.db.async_database.asyncpg.create_pool", new_callable=AsyncMock, return_value=pool) as create_pool:
+        yield pool, create_pool
+    async_database._pool = None
+
+
+class TestAsyncDatabase:
+    @pytest.mark.asyncio
+    async def test_pool_is_created_once(self, mock_pool):
+        pool, create_pool = mock_pool
+        
+        first = await async_database.get_async_pool()
+        second = await async_database.get_async_pool()
+        
+        assert first is pool
+        assert second is pool
+        assert create_pool.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_async_db_skips_transaction_by_default(self, mock_pool):
+        pool, _ = mock_pool
+        conn = MagicMock()
+        pool.acquire.return_value.__aenter__.return_value = conn
+        
+        async with async_database.get_async_db() as db:
+            assert db is conn
+        
+        conn.transaction.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_async_db_runs_writes_in_transaction(self, mock_pool):
+        pool, _ = mock_pool
+        conn = MagicMock()
+        pool.acquire.return_value.__aenter__.return_value = conn
+        
+        async with async_database.get_async_db(transaction=True) as db:
+            assert db is conn
+        
+        conn.transaction.return_value.__aenter__.assert_awaited_once()
+        conn.transaction.return_value.__aexit__.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_close_async_pool(self, mock_pool):
+        pool, _ = mock_pool
+        await async_database.get_async_pool()
+        
+        await async_database.close_async_pool()
+        
+        pool.close.assert_awaited_once()
+        assert async_database._pool is None
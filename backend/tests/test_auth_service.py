@@ -1,7 +1,19 @@
 import pytest
-from unittest.mock import Mock, patch
-
-from backend.services.auth_service import register_user, authenticate_user, generate_token, verify_token
+from unittest.mock import AsyncMock, Mock, patch
+
+from backend.services.auth_service import (
+    register_user,
+    authenticate_user,
+    register_user_async,
+    authenticate_user_async,
+    deactivate_user_async,
+    generate_token,
+    verify_token,
+    user_cache,
+    token_cache
+)
+from backend.core.security import decode_access_token
+from jose import JWTError
 
 
 @pytest.fixture
@@ -81,4 +93,111 @@ def test_verify_token_success():
 
 def test_verify_token_invalid():
     with pytest.raises(ValueError, match="Invalid token"):
-        verify_token("invalid.token.here")
\ No newline at end of file
+        verify_token("invalid.token.here")
+
+
+@pytest.mark.asyncio
+async def test_register_user_async_success():
+    conn = Mock()
+    conn.fetchval = AsyncMock(return_value=None)
+    conn.fetchrow = AsyncMock(return_value={"id": 1, "username": "testuser", "is_active": True})
+    
+    with patch("backend.services.auth_service.hash_password_async", return_value="hashed_pass"):
+        user = await register_user_async(conn, "testuser", "password123")
+    
+    assert user == {"id": 1, "username": "testuser", "is_active": True}
+    assert conn.fetchrow.call_args.args[1:] == ("testuser", "hashed_pass")
+
+
+@pytest.mark.asyncio
+async def test_register_user_async_duplicate():
+    conn = Mock()
+    conn.fetchval = AsyncMock(return_value=1)
+    
+    with pytest.raises(ValueError, match="Username already exists"):
+        await register_user_async(conn, "testuser", "password123")
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_async_success():
+    conn = Mock()
+    conn.fetchrow = AsyncMock(return_value={"id": 1, "username": "testuser", "hashed_password": "hashed", "is_active": True})
+    
+    with patch("backend.services.auth_service.verify_password_async", return_value=True):
+        user = await authenticate_user_async(conn, "testuser", "password123")
+    
+    assert user["username"] == "testuser"
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_async_wrong_password():
+    conn = Mock()
+    conn.fetchrow = AsyncMock(return_value={"id": 1, "username": "testuser", "hashed_password": "hashed", "is_active": True})
+    
+    with patch("backend.services.auth_service.verify_password_async", return_value=False):
+        with pytest.raises(ValueError, match="Invalid credentials"):
+            await authenticate_user_async(conn, "testuser", "wrongpassword")
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_async_inactive():
+    conn = Mock()
+    conn.fetchrow = AsyncMock(return_value={"id": 1, "username": "testuser", "hashed_password": "hashed", "is_active": False})
+    
+    with patch("backend.services.auth_service.verify_password_async", return_value=True):
+        with pytest.raises(ValueError, match="User is inactive"):
+            await authenticate_user_async(conn, "testuser", "password123")
+
+
+@pytest.mark.asyncio
+async def test_deactivate_user_async_invalidates_cache():
+    user_cache.set("testuser", {"id": 1, "username": "testuser", "is_active": True})
+    conn = Mock()
+    conn.execute = AsyncMock()
+    
+    await deactivate_user_async(conn, "testuser")
+    
+    assert user_cache.get("testuser") is None
+
+
+def test_register_user_invalidates_cache(mock_conn, mock_cursor):
+    user_cache.set("testuser", {"id": 1, "username": "testuser", "is_active": False})
+    
+    with patch("backend.services.auth_service.hash_password", return_value="hashed_pass"):
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.side_effect = [None, (1, "testuser", True)]
+        
+        register_user(mock_conn, "testuser", "password123")
+    
+    assert user_cache.get("testuser") is None
+
+
+def test_verify_token_skips_decode_for_cached_token():
+    token = generate_token("testuser")
+    
+    with patch("backend.services.auth_service.decode_access_token", wraps=decode_access_token) as mock_decode:
+        assert verify_token(token) == "testuser"
+        assert verify_token(token) == "testuser"
+        
+        assert mock_decode.call_count == 1
+
+
+def test_verify_token_never_accepts_cached_token_past_expiry():
+    token = generate_token("testuser")
+    verify_token(token)
+    expires_at = decode_access_token(token)["exp"]
+    
+    with patch("backend.services.auth_service.time.time", return_value=expires_at + 1):
+        with patch("backend.services.auth_service.decode_access_token", side_effect=JWTError("expired")) as mock_decode:
+            with pytest.raises(ValueError, match="Invalid token"):
+                verify_token(token)
+            
+            mock_decode.assert_called_once_with(token)
+
+
+def test_verify_token_does_not_cache_invalid_tokens():
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Invalid token"):
+            verify_token("invalid.token.here")
+    
+    assert len(token_cache) == 0
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.services.book_catalog import BookCatalog, book_fingerprint
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.executemany = AsyncMock()
+    with patch("backend.services.book_catalog.get_async_db") as mock_get_db:
+        mock_get_db.return_value.__aenter__.return_value = conn
+        yield conn
+
+
+@pytest.fixture
+def catalog():
+    catalog = BookCatalog()
+    catalog.enabled = True
+    catalog.min_results = 2
+    return catalog
+
+
+@pytest.fixture
+def mock_keywords():
+    return {"keyword_1": "dragon", "keyword_2": "quest", "keyword_3": "magic"}
+
+
+def _row(title):
+    return {
+        "title": title,
+        "authors": ["Author"],
+        "description": "Description",
+        "categories": ["Fantasy"],
+        "thumbnail": None
+    }
+
+
+class TestBookCatalogSearch:
+    @pytest.mark.asyncio
+    async def test_disabled_catalog_skips_database(self, catalog, mock_conn, mock_keywords):
+        catalog.enabled = False
+        
+        assert await catalog.search(mock_keywords) is None
+        mock_conn.fetch.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_enough_matches_are_returned(self, catalog, mock_conn, mock_keywords):
+        mock_conn.fetch.return_value = [_row("Book 1"), _row("Book 2")]
+        
+        result = await catalog.search(mock_keywords)
+        
+        assert result["total_items"] == 2
+        assert [item["title"] for item in result["items"]] == ["Book 1", "Book 2"]
+        query, terms, min_rank, limit = mock_conn.fetch.call_args.args
+        assert "websearch_to_tsquery" in query
+        assert terms == "dragon or quest or magic"
+        assert (min_rank, limit) == (catalog.min_rank, catalog.max_results)
+    
+    @pytest.mark.asyncio
+    async def test_too_few_matches_fall_through(self, catalog, mock_conn, mock_keywords):
+        mock_conn.fetch.return_value = [_row("Book 1")]
+        
+        assert await catalog.search(mock_keywords) is None
+    
+    @pytest.mark.asyncio
+    async def test_database_errors_fall_through(self, catalog, mock_conn, mock_keywords):
+        mock_conn.fetch.side_effect = OSError("connection refused")
+        
+        assert await catalog.search(mock_keywords) is None
+
+
+class TestBookCatalogIngest:
+    def test_ingest_without_worker_is_a_noop(self, catalog):
+        catalog.ingest([_row("Book 1")])
+    
+    @pytest.mark.asyncio
+    async def test_ingested_books_are_upserted_in_batches(self, catalog, mock_conn):
+        await catalog.start()
+        try:
+            catalog.ingest([_row("Book 1"), _row("Book 1"), _row("Book 2"), {"title": None}])
+            for _ in range(5):
+                await asyncio.sleep(0)
+        finally:
+            await catalog.close()
+        
+        mock_conn.executemany.assert_awaited_once()
+        query, rows = mock_conn.executemany.call_args.args
+        assert "ON CONFLICT (fingerprint) DO UPDATE" in query
+        assert [row[1] for row in rows] == ["Book 1", "Book 2"]
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_books(self, catalog, mock_conn):
+        catalog.queue_size = 1
+        await catalog.start()
+        try:
+            catalog.ingest([_row("Book 1"), _row("Book 2")])
+            assert catalog._queue.qsize() == 1
+        finally:
+            await catalog.close()
+    
+    def test_fingerprint_ignores_case_and_whitespace(self):
+        assert book_fingerprint({"title": " Dune ", "authors": ["Frank Herbert"]}) == \
+            book_fingerprint({"title": "dune", "authors": ["frank herbert "]})
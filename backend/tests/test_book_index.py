@@ -0,0 +1,186 @@
+import fcntl
+import json
+import os
+import threading
+from unittest.mock import patch
+import numpy as np
+import pytest
+
+from backend.services.book_index import (
+    BookIndex,
+    WRITER_LOCK,
+    claim_snapshot_writer,
+    compact_snapshot,
+    release_snapshot_writer,
+    save_snapshot,
+    write_snapshot
+)
+
+
+def _book(title, description, authors=None, categories=None):
+    return {
+        "title": title,
+        "authors": authors or ["Author"],
+        "description": description,
+        "categories": categories or ["Fiction"],
+        "thumbnail": None
+    }
+
+
+BOOKS = [
+    _book("Dragon Quest", "A young hero hunts a dragon across the northern kingdoms"),
+    _book("The Dragon Keeper", "Dragons, magic and a keeper who must protect them"),
+    _book("Space Station", "Astronauts repair a failing station in orbit", categories=["Science"]),
+    _book("Magic Academy", "Students learn magic and uncover an ancient dragon cult"),
+    _book("Cooking at Home", "Simple recipes for busy weeknights", categories=["Cooking"])
+]
+
+
+@pytest.fixture
+def index():
+    index = BookIndex(frozenset({"the", "and", "a", "an", "at", "for", "in", "who", "must", "them"}), enabled=True)
+    index.min_results = 1
+    index.min_score = 0.1
+    index.add_many(BOOKS)
+    return index
+
+
+def _titles(result):
+    return [item["title"] for item in result["items"]]
+
+
+class TestBookIndexSearch:
+    def test_ranks_title_matches_first(self, index):
+        result = index.search({"keyword_1": "dragon", "keyword_2": "quest", "keyword_3": "hero"})
+        
+        assert _titles(result)[0] == "Dragon Quest"
+        assert "Space Station" not in _titles(result)
+        assert "Cooking at Home" not in _titles(result)
+    
+    def test_too_few_matches_return_none(self, index):
+        index.min_results = 3
+        
+        assert index.search({"keyword_1": "astronauts", "keyword_2": "orbit", "keyword_3": "station"}) is None
+    
+    def test_disabled_index_returns_none(self, index):
+        index.enabled = False
+        
+        assert index.search({"keyword_1": "dragon", "keyword_2": "magic", "keyword_3": "quest"}) is None
+        assert index.add_many([_book("New Book", "dragon")]) == 0
+    
+    def test_duplicate_books_are_indexed_once(self, index):
+        assert index.add_many([dict(BOOKS[0]), _book("Untitled", "dragon"), {"title": None}]) == 1
+        assert len(index) == 6
+    
+    def test_index_stops_growing_at_max_documents(self, index):
+        index.max_documents = 6
+        
+        added = index.add_many([_book("Orbit Rescue", "astronauts in orbit"), _book("Deep Sea", "submarine crew")])
+        
+        assert added == 1
+        assert len(index) == 6
+        assert index.search({"keyword_1": "submarine", "keyword_2": "x", "keyword_3": "y"}) is None
+    
+    def test_scores_match_reference_bm25(self, index):
+        scores = index.score(["magic"])
+        
+        lengths = np.array(index.doc_lengths, dtype=np.float64)
+        tf = np.array([doc["description"].lower().count("magic") + doc["title"].lower().count("magic") * 2
+                       for doc in index.documents], dtype=np.float64)
+        df = np.count_nonzero(tf)
+        idf = np.log1p((len(tf) - df + 0.5) / (df + 0.5))
+        expected = idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * lengths / lengths.mean()))
+        
+        np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+
+class TestBookIndexSnapshot:
+    def test_snapshot_round_trip_is_memory_mapped(self, index, tmp_path):
+        write_snapshot(str(tmp_path), *index.snapshot())
+        assert not index.dirty
+        
+        restored = BookIndex(index.stopwords, enabled=True)
+        restored.min_results = 1
+        restored.min_score = 0.1
+        assert restored.load(str(tmp_path))
+        
+        assert isinstance(restored._base_docs, np.memmap)
+        query = {"keyword_1": "dragon", "keyword_2": "magic", "keyword_3": "keeper"}
+        assert _titles(restored.search(query)) == _titles(index.search(query))
+    
+    def test_restored_index_keeps_growing(self, index, tmp_path):
+        write_snapshot(str(tmp_path), *index.snapshot())
+        restored = BookIndex(index.stopwords, enabled=True)
+        restored.min_results = 1
+        restored.min_score = 0.1
+        restored.load(str(tmp_path))
+        
+        assert restored.add_many([BOOKS[0], _book("Orbit Rescue", "astronauts in orbit")]) == 1
+        assert _titles(restored.search({"keyword_1": "orbit", "keyword_2": "x", "keyword_3": "y"})) == \
+            ["Orbit Rescue", "Space Station"]
+        
+        write_snapshot(str(tmp_path), *restored.snapshot())
+        assert restored._delta == {}
+        assert len(restored.search({"keyword_1": "orbit", "keyword_2": "x", "keyword_3": "y"})["items"]) == 2
+    
+    def test_missing_or_inconsistent_snapshot_starts_cold(self, index, tmp_path):
+        assert not index.load(str(tmp_path / "missing"))
+        
+        write_snapshot(str(tmp_path), *index.snapshot())
+        meta = json.loads((tmp_path / "index.json").read_text())
+        meta["documents"].pop()
+        (tmp_path / "index.json").write_text(json.dumps(meta))
+        
+        assert not index.load(str(tmp_path))
+        assert len(index) == 5
+    
+    def test_books_added_during_compaction_are_kept(self, index, tmp_path):
+        view = index.freeze()
+        index.add(_book("Orbit Rescue", "astronauts in orbit"))
+        arrays, meta = compact_snapshot(view)
+        index.adopt(view, arrays)
+        
+        assert len(meta["documents"]) == 5
+        assert index.dirty
+        assert _titles(index.search({"keyword_1": "orbit", "keyword_2": "x", "keyword_3": "y"})) == \
+            ["Orbit Rescue", "Space Station"]
+        assert _titles(index.search({"keyword_1": "dragon", "keyword_2": "x", "keyword_3": "y"}))[0] == "Dragon Quest"
+    
+    @pytest.mark.asyncio
+    async def test_save_snapshot_compacts_off_the_event_loop(self, index, tmp_path):
+        threads = []
+        
+        def compact(view):
+            threads.append(threading.current_thread())
+            return compact_snapshot(view)
+        
+        with patch("backend.services.book_index.book_index", index), \
+             patch("backend.services.book_index.compact_snapshot", side_effect=compact):
+            assert await save_snapshot(str(tmp_path))
+        
+        assert threads and threads[0] is not threading.main_thread()
+        assert index._delta == {}
+        assert not index.dirty
+        assert (tmp_path / "index.json").exists()
+    
+    def test_snapshot_leaves_no_temporary_files(self, index, tmp_path):
+        write_snapshot(str(tmp_path), *index.snapshot())
+        
+        assert sorted(path.name for path in tmp_path.iterdir()) == \
+            ["docs.npy", "index.json", "lengths.npy", "offsets.npy", "tfs.npy"]
+
+
+class TestSnapshotWriter:
+    def test_only_one_process_claims_the_snapshot_directory(self, tmp_path):
+        other_worker = os.open(tmp_path / WRITER_LOCK, os.O_RDWR | os.O_CREAT)
+        fcntl.flock(other_worker, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        try:
+            assert not claim_snapshot_writer(str(tmp_path))
+        finally:
+            os.close(other_worker)
+        
+        try:
+            assert claim_snapshot_writer(str(tmp_path))
+            assert claim_snapshot_writer(str(tmp_path))
+        finally:
+            release_snapshot_writer()
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
@@ -122,4 +123,185 @@ class TestBooksRouter:
                     
                     assert response.status_code == 500
         finally:
-            app.dependency_overrides = {}
\ No newline at end of file
+            app.dependency_overrides = {}
+
+
+class TestBooksStreamRouter:
+    
+    def test_stream_emits_keywords_then_books_then_done(self, mock_keywords, mock_google_books_result, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords_streaming", new_callable=AsyncMock) as mock_ollama:
+                with patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                    mock_ollama.return_value = mock_keywords
+                    mock_google.return_value = mock_google_books_result
+                    
+                    response = client.post(
+                        "/books/search/stream",
+                        json={"description": "I am looking for action books with superheroes and magic"}
+                    )
+                    
+                    assert response.status_code == 200
+                    assert response.headers["content-type"].startswith("application/x-ndjson")
+                    events = [json.loads(line) for line in response.text.splitlines()]
+                    assert [event["type"] for event in events] == ["keywords", "book", "book", "done"]
+                    assert events[0]["query_keywords"] == "action superhero magic"
+                    assert events[1]["item"]["title"] == "Book 1"
+                    assert events[-1]["total_items"] == 50
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_stream_reports_google_error_after_keywords(self, mock_keywords, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords_streaming", new_callable=AsyncMock) as mock_ollama:
+                with patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                    mock_ollama.return_value = mock_keywords
+                    mock_google.side_effect = Exception("Google API Error")
+                    
+                    response = client.post(
+                        "/books/search/stream",
+                        json={"description": "I want action books"}
+                    )
+                    
+                    events = [json.loads(line) for line in response.text.splitlines()]
+                    assert [event["type"] for event in events] == ["keywords", "error"]
+                    assert "Google API Error" in events[-1]["detail"]
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_stream_requires_authentication(self):
+        response = client.post("/books/search/stream", json={"description": "action books"})
+        
+        assert response.status_code == 401
+
+
+class TestBooksCatalogRouting:
+    
+    def test_catalog_hit_skips_google_books(self, mock_keywords, mock_google_books_result, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock) as mock_ollama, \
+                 patch("backend.api.routes.books.book_catalog.search", new_callable=AsyncMock) as mock_catalog, \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                mock_ollama.return_value = mock_keywords
+                mock_catalog.return_value = mock_google_books_result
+                
+                response = client.post("/books/search", json={"description": "dragons and magic quests"})
+                
+                assert response.status_code == 200
+                assert len(response.json()["items"]) == 2
+                mock_catalog.assert_awaited_once_with(mock_keywords)
+                mock_google.assert_not_called()
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_catalog_miss_falls_through_to_google_books(self, mock_keywords, mock_google_books_result, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock) as mock_ollama, \
+                 patch("backend.api.routes.books.book_catalog.search", new_callable=AsyncMock) as mock_catalog, \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                mock_ollama.return_value = mock_keywords
+                mock_catalog.return_value = None
+                mock_google.return_value = mock_google_books_result
+                
+                response = client.post("/books/search", json={"description": "dragons and magic quests"})
+                
+                assert response.status_code == 200
+                assert response.json()["total_items"] == 50
+                mock_google.assert_awaited_once_with(mock_keywords, 0, 10)
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_index_hit_skips_catalog_and_google_books(self, mock_keywords, mock_google_books_result, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock) as mock_ollama, \
+                 patch("backend.api.routes.books.book_index.search") as mock_index, \
+                 patch("backend.api.routes.books.book_catalog.search", new_callable=AsyncMock) as mock_catalog, \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                mock_ollama.return_value = mock_keywords
+                mock_index.return_value = mock_google_books_result
+                
+                response = client.post("/books/search", json={"description": "dragons and magic quests"})
+                
+                assert response.status_code == 200
+                assert len(response.json()["items"]) == 2
+                mock_catalog.assert_not_called()
+                mock_google.assert_not_called()
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_upstream_results_are_added_to_the_index(self, mock_keywords, mock_google_books_result, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock) as mock_ollama, \
+                 patch("backend.api.routes.books.book_index.add_many") as mock_add, \
+                 patch("backend.api.routes.books.book_catalog.search", new_callable=AsyncMock) as mock_catalog, \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                mock_ollama.return_value = mock_keywords
+                mock_catalog.return_value = None
+                mock_google.return_value = mock_google_books_result
+                
+                client.post("/books/search", json={"description": "dragons and magic quests"})
+                
+                mock_add.assert_called_once_with(mock_google_books_result["items"])
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_cached_google_page_skips_local_sources(self, mock_keywords, mock_google_books_result, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock) as mock_ollama, \
+                 patch("backend.api.routes.books.google_books_service.is_cached", return_value=True), \
+                 patch("backend.api.routes.books.book_index.search") as mock_index, \
+                 patch("backend.api.routes.books.book_catalog.search", new_callable=AsyncMock) as mock_catalog, \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                mock_ollama.return_value = mock_keywords
+                mock_google.return_value = mock_google_books_result
+                
+                response = client.post("/books/search", json={"description": "dragons and magic quests"})
+                
+                assert response.json()["total_items"] == 50
+                mock_index.assert_not_called()
+                mock_catalog.assert_not_called()
+                mock_google.assert_awaited_once_with(mock_keywords, 0, 10)
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_pages_larger_than_local_cap_go_to_google_books(self, mock_keywords, mock_google_books_result, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock) as mock_ollama, \
+                 patch("backend.api.routes.books.book_index.search") as mock_index, \
+                 patch("backend.api.routes.books.book_catalog.search", new_callable=AsyncMock) as mock_catalog, \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                mock_ollama.return_value = mock_keywords
+                mock_google.return_value = mock_google_books_result
+                
+                response = client.post("/books/search", json={"description": "dragons and magic quests", "max_results": 40})
+                
+                assert response.json()["total_items"] == 50
+                mock_index.assert_not_called()
+                mock_catalog.assert_not_called()
+                mock_google.assert_awaited_once_with(mock_keywords, 0, 40)
+        finally:
+            app.dependency_overrides = {}
+    
+    def test_local_page_reports_only_the_items_it_can_serve(self, mock_keywords, mock_user):
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        local = {"total_items": 30, "items": [{"title": f"Book {index}"} for index in range(10)]}
+        try:
+            with patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock) as mock_ollama, \
+                 patch("backend.api.routes.books.book_index.search", return_value=local), \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock) as mock_google:
+                mock_ollama.return_value = mock_keywords
+                
+                response = client.post("/books/search", json={"description": "dragons and magic quests", "max_results": 5})
+                
+                assert response.json()["total_items"] == 5
+                assert len(response.json()["items"]) == 5
+                mock_google.assert_not_called()
+        finally:
+            app.dependency_overrides = {}
@@ -0,0 +1,103 @@
+import pytest
+from unittest.mock import patch
+
+from backend.core.cache import TTLCache
+from backend.core.metrics import cache_lookups_total, cache_evictions_total
+
+
+@pytest.fixture
+def clock():
+    now = [1000.0]
+    with patch("backend.core.cache.time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+class TestTTLCache:
+    def test_get_returns_stored_value(self):
+        cache = TTLCache("test_basic", maxsize=10, ttl=60)
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+    
+    def test_entries_expire_after_ttl(self, clock):
+        cache = TTLCache("test_expiry", maxsize=10, ttl=5)
+        cache.set("a", 1)
+        
+        clock[0] += 6
+        
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_per_entry_ttl_cannot_exceed_cache_ttl(self, clock):
+        cache = TTLCache("test_entry_ttl", maxsize=10, ttl=5)
+        cache.set("short", 1, ttl=1)
+        cache.set("long", 2, ttl=100)
+        
+        clock[0] += 2
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        
+        clock[0] += 4
+        assert cache.get("long") is None
+    
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache("test_lru", maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache_evictions_total.labels(cache="test_lru")._value.get() == 1
+    
+    def test_evicts_to_stay_within_max_bytes(self):
+        cache = TTLCache("test_bytes", maxsize=10, ttl=60, max_bytes=10, sizeof=lambda key, value: len(value))
+        cache.set("a", "xxxxxx")
+        cache.set("b", "yyyyyy")
+        
+        assert cache.get("a") is None
+        assert cache.get("b") == "yyyyyy"
+    
+    def test_stale_entries_are_served_by_get_stale(self, clock):
+        cache = TTLCache("test_stale", maxsize=10, ttl=5, stale_ttl=10)
+        cache.set("a", 1)
+        
+        clock[0] += 6
+        
+        assert cache.get("a") is None
+        assert cache.get_stale("a") == (1, 6)
+        
+        clock[0] += 10
+        assert cache.get_stale("a") is None
+    
+    def test_get_stale_reports_age_of_fresh_entries(self, clock):
+        cache = TTLCache("test_age", maxsize=10, ttl=5, stale_ttl=10)
+        cache.set("a", 1)
+        
+        clock[0] += 2
+        
+        assert cache.get_stale("a") == (1, 2)
+        assert cache_lookups_total.labels(cache="test_age", result="hit")._value.get() == 1
+    
+    def test_records_hits_and_misses(self):
+        cache = TTLCache("test_counters", maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        
+        assert cache_lookups_total.labels(cache="test_counters", result="hit")._value.get() == 1
+        assert cache_lookups_total.labels(cache="test_counters", result="miss")._value.get() == 1
+    
+    def test_invalidate_and_clear(self):
+        cache = TTLCache("test_invalidate", maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from backend.core.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN, OPEN
+from backend.core.metrics import circuit_breaker_state
+
+
+@pytest.fixture
+def clock():
+    now = [1000.0]
+    with patch("backend.core.circuit_breaker.time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=2, slow_call_threshold=1.0, reset_timeout=30.0)
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise RuntimeError("upstream failed")
+
+
+class TestCircuitBreaker:
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self, breaker):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await breaker.call(fail)
+        
+        assert breaker.state == OPEN
+        assert circuit_breaker_state.labels(service="test")._value.get() == 2
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(succeed)
+    
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self, breaker):
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+        await breaker.call(succeed)
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+        
+        assert breaker.state == CLOSED
+    
+    @pytest.mark.asyncio
+    async def test_slow_calls_count_as_failures(self, breaker, clock):
+        async def slow():
+            clock[0] += 2
+            return "slow"
+        
+        assert await breaker.call(slow) == "slow"
+        assert await breaker.call(slow) == "slow"
+        
+        assert breaker.state == OPEN
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes_on_success(self, breaker, clock):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await breaker.call(fail)
+        
+        clock[0] += 31
+        assert not breaker.is_open
+        assert await breaker.call(succeed) == "ok"
+        
+        assert breaker.state == CLOSED
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_reopens_on_failure(self, breaker, clock):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await breaker.call(fail)
+        
+        clock[0] += 31
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+        
+        assert breaker.state == OPEN
+        assert breaker.is_open
+    
+    @pytest.mark.asyncio
+    async def test_half_open_allows_limited_probes(self, breaker, clock):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await breaker.call(fail)
+        clock[0] += 31
+        release = asyncio.Event()
+        
+        async def probe():
+            await release.wait()
+            return "ok"
+        
+        pending = asyncio.ensure_future(breaker.call(probe))
+        await asyncio.sleep(0)
+        
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(succeed)
+        
+        release.set()
+        assert await pending == "ok"
+        assert breaker.state == CLOSED
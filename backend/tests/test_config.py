@@ -1,4 +1,5 @@
 import pytest
+from pydantic import ValidationError
 from backend.core.config import Settings
 
 
@@ -30,4 +31,23 @@ class TestSettings:
     def test_custom_google_books_timeout(self):
         settings = Settings(google_books_timeout=20.0)
         
-        assert settings.google_books_timeout == 20.0
\ No newline at end of file
+        assert settings.google_books_timeout == 20.0
+    
+    def test_default_http_client_pool_settings(self):
+        settings = Settings()
+        
+        assert settings.ollama_max_connections == 20
+        assert settings.google_books_max_connections == 50
+        assert settings.google_books_http2 is True
+    
+    def test_password_hash_settings(self):
+        settings = Settings(bcrypt_rounds=4, password_hash_executor="thread")
+        
+        assert settings.bcrypt_rounds == 4
+        assert settings.password_hash_executor == "thread"
+        assert Settings().password_hash_max_queue == 32
+    
+    def test_username_label_limit_must_not_be_negative(self):
+        assert Settings(metrics_username_label_limit=0).metrics_username_label_limit == 0
+        with pytest.raises(ValidationError):
+            Settings(metrics_username_label_limit=-1)
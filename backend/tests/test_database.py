@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import Mock, patch
+import psycopg2
+from psycopg2 import extensions
+
+from backend.db.database import ConnectionPool, PoolTimeoutError, get_db
+
+
+def make_connection():
+    conn = Mock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def mock_connect():
+    with patch("backend.db.database.psycopg2.connect", side_effect=lambda dsn: make_connection()) as connect:
+        yield connect
+
+
+class TestConnectionPool:
+    def test_opens_min_size_connections(self, mock_connect):
+        ConnectionPool("dsn", min_size=2, max_size=5, timeout=1.0)
+        
+        assert mock_connect.call_count == 2
+    
+    def test_reuses_released_connection(self, mock_connect):
+        pool = ConnectionPool("dsn", min_size=1, max_size=5, timeout=1.0)
+        
+        conn = pool.getconn()
+        pool.putconn(conn)
+        
+        assert pool.getconn() is conn
+        assert mock_connect.call_count == 1
+    
+    def test_checkout_times_out_when_exhausted(self, mock_connect):
+        pool = ConnectionPool("dsn", min_size=0, max_size=1, timeout=0.05)
+        pool.getconn()
+        
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn()
+    
+    def test_replaces_unhealthy_connection(self, mock_connect):
+        pool = ConnectionPool("dsn", min_size=1, max_size=5, timeout=1.0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.cursor.return_value.execute.side_effect = psycopg2.OperationalError("gone")
+        
+        replacement = pool.getconn()
+        
+        assert replacement is not conn
+        conn.close.assert_called()
+    
+    def test_discards_closed_connection_on_release(self, mock_connect):
+        pool = ConnectionPool("dsn", min_size=0, max_size=5, timeout=1.0)
+        conn = pool.getconn()
+        conn.closed = 1
+        
+        pool.putconn(conn)
+        
+        assert pool.getconn() is not conn
+
+
+class TestGetDb:
+    def test_commits_and_releases(self):
+        pool = Mock()
+        conn = pool.getconn.return_value
+        
+        with patch("backend.db.database.get_pool", return_value=pool):
+            with get_db() as db:
+                assert db is conn
+        
+        conn.commit.assert_called_once()
+        pool.putconn.assert_called_once_with(conn)
+    
+    def test_rolls_back_and_releases_on_error(self):
+        pool = Mock()
+        conn = pool.getconn.return_value
+        
+        with patch("backend.db.database.get_pool", return_value=pool):
+            with pytest.raises(ValueError):
+                with get_db():
+                    raise ValueError("boom")
+        
+        conn.rollback.assert_called_once()
+        pool.putconn.assert_called_once_with(conn)
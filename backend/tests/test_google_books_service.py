@@ -1,6 +1,29 @@
+import asyncio
+import json
+import httpx
 import pytest
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode
 from unittest.mock import AsyncMock, patch, MagicMock
-from backend.services.google_books_service import GoogleBooksService
+from backend.services.google_books_service import GoogleBooksService, ResponseTooLargeError, VOLUME_FIELDS
+from backend.core.metrics import hedged_requests_total
+
+
+def streamed(get):
+    @asynccontextmanager
+    async def stream(method, url, **kwargs):
+        response = await get(url, **kwargs)
+        body = json.dumps(response.json.return_value).encode()
+        response.headers = {}
+        
+        async def aiter_bytes():
+            yield body[:len(body) // 2]
+            yield body[len(body) // 2:]
+        
+        response.aiter_bytes = aiter_bytes
+        yield response
+    
+    return MagicMock(side_effect=stream)
 
 
 @pytest.fixture
@@ -43,7 +66,7 @@ class TestGoogleBooksService:
         mock_response.raise_for_status = MagicMock()
         
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(AsyncMock(return_value=mock_response))
             
             keywords = {"keyword_1": "action", "keyword_2": "superhero", "keyword_3": "comics"}
             result = await service.search_books(keywords)
@@ -60,7 +83,7 @@ class TestGoogleBooksService:
         mock_response.raise_for_status = MagicMock()
         
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(AsyncMock(return_value=mock_response))
             
             keywords = {"keyword_1": "xyz", "keyword_2": "abc", "keyword_3": "def"}
             result = await service.search_books(keywords)
@@ -76,7 +99,7 @@ class TestGoogleBooksService:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.get = mock_get
+            mock_client.return_value.stream = streamed(mock_get)
             
             keywords = {"keyword_1": "action", "keyword_2": "superhero", "keyword_3": "comics"}
             await service.search_books(keywords)
@@ -84,6 +107,8 @@ class TestGoogleBooksService:
             call_args = mock_get.call_args
             assert call_args.kwargs["params"]["q"] == "action+superhero+comics"
             assert call_args.kwargs["params"]["maxResults"] == 10
+            assert call_args.kwargs["params"]["startIndex"] == 0
+            assert call_args.kwargs["params"]["fields"] == VOLUME_FIELDS
     
     @pytest.mark.asyncio
     async def test_search_books_handles_missing_fields(self, service):
@@ -95,11 +120,331 @@ class TestGoogleBooksService:
         mock_response.raise_for_status = MagicMock()
         
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(AsyncMock(return_value=mock_response))
             
             keywords = {"keyword_1": "test", "keyword_2": "book", "keyword_3": "search"}
             result = await service.search_books(keywords)
             
             assert result["items"][0]["title"] == "Incomplete Book"
             assert result["items"][0]["authors"] is None
-            assert result["items"][0]["description"] is None
\ No newline at end of file
+            assert result["items"][0]["description"] is None
+    
+    @pytest.mark.asyncio
+    async def test_search_books_uses_pooled_http2_client(self, service, mock_api_response):
+        mock_response = MagicMock()
+        mock_response.json.return_value = mock_api_response
+        mock_response.raise_for_status = MagicMock()
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = streamed(AsyncMock(return_value=mock_response))
+            
+            keywords = {"keyword_1": "action", "keyword_2": "superhero", "keyword_3": "comics"}
+            await service.search_books(keywords)
+            await service.search_books(keywords)
+            
+            assert mock_client.call_count == 1
+            assert mock_client.call_args.kwargs["http2"] is True
+            assert mock_client.call_args.kwargs["limits"].max_connections == 50
+
+
+class TestGoogleBooksPaging:
+    @pytest.fixture
+    def keywords(self):
+        return {"keyword_1": "action", "keyword_2": "superhero", "keyword_3": "comics"}
+    
+    @pytest.fixture
+    def mock_response(self, mock_api_response):
+        response = MagicMock()
+        response.json.return_value = mock_api_response
+        response.raise_for_status = MagicMock()
+        return response
+    
+    @pytest.mark.asyncio
+    async def test_pages_are_requested_and_cached_separately(self, service, keywords, mock_response):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await service.search_books(keywords, start_index=0, max_results=20)
+            await service.search_books(keywords, start_index=20, max_results=20)
+            await service.search_books(keywords, start_index=20, max_results=20)
+            
+            pages = [(call.kwargs["params"]["startIndex"], call.kwargs["params"]["maxResults"]) for call in mock_get.call_args_list]
+            assert pages == [(0, 20), (20, 20)]
+    
+    @pytest.mark.asyncio
+    async def test_next_page_is_prefetched(self, service, keywords, mock_response):
+        service.prefetch_next_page = True
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await service.search_books(keywords, start_index=0, max_results=10)
+            await asyncio.gather(*service._refresh_tasks)
+            await service.search_books(keywords, start_index=10, max_results=10)
+            await asyncio.gather(*service._refresh_tasks)
+            
+            starts = [call.kwargs["params"]["startIndex"] for call in mock_get.call_args_list]
+            assert starts == [0, 10, 20]
+    
+    @pytest.mark.asyncio
+    async def test_last_page_is_not_prefetched(self, service, keywords, mock_response):
+        service.prefetch_next_page = True
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await service.search_books(keywords, start_index=90, max_results=10)
+            
+            assert not service._refresh_tasks
+            assert mock_get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_oversized_body_is_rejected(self, service, keywords, mock_response):
+        service.max_response_bytes = 100
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = streamed(AsyncMock(return_value=mock_response))
+            
+            with pytest.raises(ResponseTooLargeError):
+                await service.search_books(keywords)
+    
+    @pytest.mark.asyncio
+    async def test_oversized_content_length_is_rejected_before_reading(self, service, keywords):
+        response = MagicMock()
+        response.headers = {"content-length": str(service.max_response_bytes + 1)}
+        response.aiter_bytes = MagicMock()
+        
+        @asynccontextmanager
+        async def stream(method, url, **kwargs):
+            yield response
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = MagicMock(side_effect=stream)
+            
+            with pytest.raises(ResponseTooLargeError):
+                await service.search_books(keywords)
+            response.aiter_bytes.assert_not_called()
+
+
+class TestGoogleBooksCache:
+    @pytest.fixture
+    def clock(self):
+        now = [1000.0]
+        with patch("backend.core.cache.time.monotonic", side_effect=lambda: now[0]):
+            yield now
+    
+    @pytest.fixture
+    def keywords(self):
+        return {"keyword_1": "action", "keyword_2": "superhero", "keyword_3": "comics"}
+    
+    @pytest.fixture
+    def mock_response(self, mock_api_response):
+        response = MagicMock()
+        response.json.return_value = mock_api_response
+        response.raise_for_status = MagicMock()
+        return response
+    
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_api(self, service, keywords, mock_response):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await service.search_books(keywords)
+            result = await service.search_books({"keyword_1": "Action ", "keyword_2": "SUPERHERO", "keyword_3": "comics"})
+            
+            assert result["total_items"] == 100
+            assert mock_get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_is_cached_reports_fresh_pages_only(self, service, keywords, mock_response, clock):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = streamed(AsyncMock(return_value=mock_response))
+            
+            assert not service.is_cached(keywords)
+            await service.search_books(keywords)
+            
+            assert service.is_cached(keywords)
+            assert not service.is_cached(keywords, 10, 10)
+            clock[0] += service.cache.ttl + 1
+            assert not service.is_cached(keywords)
+    
+    @pytest.mark.asyncio
+    async def test_stale_hit_is_served_and_refreshed(self, service, keywords, mock_response, clock):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await service.search_books(keywords)
+            clock[0] += service.cache.ttl + 1
+            
+            result = await service.search_books(keywords)
+            await asyncio.gather(*service._refresh_tasks)
+            
+            assert result["total_items"] == 100
+            assert mock_get.call_count == 2
+            assert service.cache.local.get_stale(urlencode(sorted(mock_get.call_args.kwargs["params"].items())))[1] == 0
+    
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_when_api_fails(self, service, keywords, mock_response, clock):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = streamed(AsyncMock(side_effect=[mock_response, httpx.TimeoutException("timeout")]))
+            
+            await service.search_books(keywords)
+            clock[0] += service.cache.ttl + service.stale_ttl + 1
+            
+            result = await service.search_books(keywords)
+            
+            assert result["total_items"] == 100
+    
+    @pytest.mark.asyncio
+    async def test_miss_propagates_api_errors(self, service, keywords):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = streamed(AsyncMock(side_effect=httpx.TimeoutException("timeout")))
+            
+            with pytest.raises(httpx.TimeoutException):
+                await service.search_books(keywords)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self, service, keywords, mock_response):
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(side_effect=slow_get)
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            results = await asyncio.gather(*[service.search_books(keywords) for _ in range(4)])
+            
+            assert all(result["total_items"] == 100 for result in results)
+            assert mock_get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_open_breaker_serves_stale_without_calling_api(self, service, keywords, mock_response, clock):
+        service.breaker.failure_threshold = 1
+        service.breaker.reset_timeout = service.cache.ttl + service.cache.stale_ttl * 2
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(side_effect=[mock_response, httpx.TimeoutException("timeout")])
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await service.search_books(keywords)
+            with pytest.raises(httpx.TimeoutException):
+                await service.search_books({"keyword_1": "other", "keyword_2": "query", "keyword_3": "here"})
+            clock[0] += service.cache.ttl + service.stale_ttl + 1
+            
+            result = await service.search_books(keywords)
+            
+            assert result["total_items"] == 100
+            assert mock_get.call_count == 2
+
+
+class TestGoogleBooksHedging:
+    @pytest.fixture
+    def hedged_service(self, service):
+        service.hedge_delay = 0.01
+        service.hedge_budget = 1.0
+        return service
+    
+    @pytest.fixture
+    def keywords(self):
+        return {"keyword_1": "action", "keyword_2": "superhero", "keyword_3": "comics"}
+    
+    def make_response(self, total_items):
+        response = MagicMock()
+        response.json.return_value = {"totalItems": total_items, "items": []}
+        response.raise_for_status = MagicMock()
+        return response
+    
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, hedged_service, keywords):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(return_value=self.make_response(1))
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await hedged_service.search_books(keywords)
+            
+            assert mock_get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_loser_cancelled(self, hedged_service, keywords):
+        cancelled = asyncio.Event()
+        responses = [self.make_response(1), self.make_response(2)]
+        
+        async def get(*args, **kwargs):
+            response = responses.pop(0)
+            if response.json.return_value["totalItems"] == 1:
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return response
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = streamed(AsyncMock(side_effect=get))
+            
+            result = await hedged_service.search_books(keywords)
+            await asyncio.sleep(0)
+            
+            assert result["total_items"] == 2
+            assert cancelled.is_set()
+    
+    @pytest.mark.asyncio
+    async def test_hedge_falls_back_to_primary_when_hedge_fails(self, hedged_service, keywords):
+        calls = []
+        
+        async def get(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.03)
+                return self.make_response(1)
+            raise httpx.ConnectError("refused")
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream = streamed(AsyncMock(side_effect=get))
+            
+            result = await hedged_service.search_books(keywords)
+            
+            assert result["total_items"] == 1
+            assert len(calls) == 2
+    
+    @pytest.mark.asyncio
+    async def test_hedges_are_limited_by_budget(self, hedged_service, keywords):
+        hedged_service.hedge_budget = 0.5
+        
+        async def get(*args, **kwargs):
+            await asyncio.sleep(0.02)
+            return self.make_response(1)
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = AsyncMock(side_effect=get)
+            mock_client.return_value.stream = streamed(mock_get)
+            
+            await hedged_service.search_books(keywords)
+            
+            assert mock_get.call_count == 1
+            assert hedged_requests_total.labels(service="google_books", outcome="skipped")._value.get() >= 1
+    
+    @pytest.mark.asyncio
+    async def test_hedge_success_wins_when_primary_fails_in_same_wakeup(self, hedged_service):
+        for _ in range(20):
+            gate = asyncio.Event()
+            calls = []
+            
+            async def get(params):
+                calls.append(1)
+                primary = len(calls) == 1
+                if not primary:
+                    asyncio.get_running_loop().call_soon(gate.set)
+                await gate.wait()
+                if primary:
+                    raise RuntimeError("primary failed")
+                return b"hedge"
+            
+            with patch.object(hedged_service, "_get", side_effect=get):
+                assert await hedged_service._send({}) == b"hedge"
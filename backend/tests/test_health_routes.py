@@ -1,8 +1,12 @@
+import asyncio
+import gzip
+import time
 import pytest
 from unittest.mock import patch
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from backend.api.routes.health import router
+from backend.api.routes.health import router, _exposition
+from backend.core.cache import TTLCache
 
 
 app = FastAPI()
@@ -30,4 +34,66 @@ class TestHealthRoutes:
         
         assert response.status_code == 200
         assert "text/plain" in response.headers["content-type"]
-        assert "charset=utf-8" in response.headers["content-type"]
\ No newline at end of file
+        assert "charset=utf-8" in response.headers["content-type"]
+    
+    def test_metrics_served_gzipped_when_accepted(self, client):
+        with patch("backend.api.routes.health.get_metrics", return_value=b"# HELP probe Probe\n"):
+            response = client.get("/metrics", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == b"# HELP probe Probe\n"
+    
+    def test_metrics_not_gzipped_when_refused(self, client):
+        response = client.get("/metrics", headers={"Accept-Encoding": "gzip;q=0, identity"})
+        
+        assert "content-encoding" not in response.headers
+    
+    def test_metrics_rendered_off_the_event_loop(self, client):
+        with patch("backend.api.routes.health.asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+            client.get("/metrics", headers={"Accept-Encoding": "identity"})
+        
+        mock_to_thread.assert_called_once()
+
+
+class TestMetricsExposition:
+    @pytest.fixture(autouse=True)
+    def exposition_cache(self):
+        cache = TTLCache("metrics_exposition", maxsize=2, ttl=5.0)
+        with patch("backend.api.routes.health.exposition_cache", cache):
+            yield cache
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_scrapes_share_one_render(self):
+        renders = []
+        
+        def render():
+            renders.append(1)
+            time.sleep(0.02)
+            return b"metric 1\n"
+        
+        with patch("backend.api.routes.health.get_metrics", side_effect=render):
+            payloads = await asyncio.gather(*[_exposition("identity") for _ in range(5)])
+        
+        assert payloads == [b"metric 1\n"] * 5
+        assert len(renders) == 1
+    
+    @pytest.mark.asyncio
+    async def test_rendered_payload_is_cached_per_encoding(self):
+        with patch("backend.api.routes.health.get_metrics", return_value=b"metric 1\n") as mock_get_metrics:
+            await _exposition("identity")
+            await _exposition("identity")
+            gzipped = await _exposition("gzip")
+        
+        assert mock_get_metrics.call_count == 2
+        assert gzip.decompress(gzipped) == b"metric 1\n"
+    
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_caching(self):
+        with patch("backend.api.routes.health.exposition_cache", TTLCache("metrics_exposition", maxsize=2, ttl=0.0)):
+            with patch("backend.api.routes.health.get_metrics", return_value=b"metric 1\n") as mock_get_metrics:
+                await _exposition("identity")
+                await _exposition("identity")
+        
+        assert mock_get_metrics.call_count == 2
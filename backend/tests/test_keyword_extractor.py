@@ -0,0 +1,30 @@
+import pytest
+
+from backend.services.keyword_extractor import LocalKeywordExtractor, local_keyword_extractor
+
+
+class TestLocalKeywordExtractor:
+    def test_skips_stopwords_and_generic_book_words(self):
+        keywords = local_keyword_extractor.extract("I am looking for action books with superheroes and magic")
+        
+        assert keywords == ["action", "superheroes", "magic"]
+    
+    def test_repeated_terms_score_higher(self):
+        keywords = local_keyword_extractor.extract("Space opera with galactic politics, space battles and space pirates")
+        
+        assert keywords[0] == "space"
+    
+    def test_pads_with_fallback_words(self):
+        result = local_keyword_extractor.extract_keywords("Science book")
+        
+        assert result == {"keyword_1": "science", "keyword_2": "book", "keyword_3": "fiction"}
+    
+    def test_only_stopwords_returns_fallback(self):
+        result = local_keyword_extractor.extract_keywords("what is the")
+        
+        assert result == {"keyword_1": "fiction", "keyword_2": "novel", "keyword_3": "book"}
+    
+    def test_custom_vocabulary(self):
+        extractor = LocalKeywordExtractor(frozenset({"the"}), ["dragon"])
+        
+        assert extractor.extract("the dragon knight") == ["knight", "dragon"]
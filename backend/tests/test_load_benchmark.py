@@ -0,0 +1,124 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.benchmarks.load.fakes import FakeConfig, create_google_books_app, create_ollama_app, parse_latency
+from backend.benchmarks.load.runner import compare, make_descriptions, summarize
+from backend.services.ollama_service import parse_keywords, parse_numbered_keywords
+
+
+class TestParseLatency:
+    def test_fixed_latency_is_converted_to_seconds(self):
+        assert parse_latency("fixed:250")() == 0.25
+    
+    def test_uniform_latency_stays_within_bounds(self):
+        sample = parse_latency("uniform:10:20")
+        
+        assert all(0.01 <= sample() <= 0.02 for _ in range(100))
+    
+    def test_lognormal_latency_is_positive(self):
+        sample = parse_latency("lognormal:100:0.5")
+        
+        assert all(sample() > 0 for _ in range(100))
+    
+    @pytest.mark.parametrize("spec", ["fixed", "uniform:10", "gaussian:1:2", "fixed:fast"])
+    def test_invalid_specs_are_rejected(self, spec):
+        with pytest.raises(ValueError):
+            parse_latency(spec)
+
+
+class TestFakeOllama:
+    def test_single_prompt_returns_three_keywords(self):
+        client = TestClient(create_ollama_app(FakeConfig()))
+        
+        response = client.post("/api/generate", json={"model": "m", "prompt": "dragons at sea", "stream": False})
+        
+        assert response.status_code == 200
+        assert len(parse_keywords(response.json()["response"])) == 3
+        assert response.json()["response"] == client.post(
+            "/api/generate", json={"model": "m", "prompt": "dragons at sea", "stream": False}
+        ).json()["response"]
+    
+    def test_batch_prompt_answers_every_numbered_description(self):
+        client = TestClient(create_ollama_app(FakeConfig()))
+        prompt = "Extract exactly 3 keywords from each description.\n1. dragons\n2. pirates\n3. robots"
+        
+        response = client.post("/api/generate", json={"prompt": prompt, "stream": False})
+        
+        assert all(parse_numbered_keywords(response.json()["response"], 3))
+    
+    def test_streaming_prompt_ends_with_done_chunk(self):
+        client = TestClient(create_ollama_app(FakeConfig()))
+        
+        response = client.post("/api/generate", json={"prompt": "dragons", "stream": True})
+        lines = response.text.splitlines()
+        
+        assert len(lines) == 4
+        assert lines[-1] == '{"response":"","done":true}'
+    
+    def test_error_rate_returns_server_errors(self):
+        client = TestClient(create_ollama_app(FakeConfig(error_rate=1.0)))
+        
+        response = client.post("/api/generate", json={"prompt": "dragons", "stream": False})
+        
+        assert response.status_code == 500
+
+
+class TestFakeGoogleBooks:
+    def test_volumes_honour_paging_and_payload_size(self):
+        client = TestClient(create_google_books_app(FakeConfig(total_items=25, description_bytes=100)))
+        
+        response = client.get("/books/v1/volumes", params={"q": "dragon+magic", "startIndex": 20, "maxResults": 10})
+        data = response.json()
+        
+        assert data["totalItems"] == 25
+        assert len(data["items"]) == 5
+        assert len(data["items"][0]["volumeInfo"]["description"]) == 100
+        assert data["items"][0]["volumeInfo"]["title"] == "Dragon Magic Volume 21"
+    
+    def test_error_rate_returns_service_unavailable(self):
+        client = TestClient(create_google_books_app(FakeConfig(error_rate=1.0)))
+        
+        assert client.get("/books/v1/volumes", params={"q": "dragon"}).status_code == 503
+
+
+class TestReport:
+    def test_summarize_reports_throughput_percentiles_and_errors(self):
+        summary = summarize(8, [0.01] * 98 + [0.5, 1.0], {"500": 3, "ReadTimeout": 1}, 2.0)
+        
+        assert summary["requests"] == 104
+        assert summary["errors"] == 4
+        assert summary["error_breakdown"] == {"500": 3, "ReadTimeout": 1}
+        assert summary["rps"] == 52.0
+        assert summary["p50_ms"] == 10.0
+        assert summary["p99_ms"] > 490
+    
+    def test_summarize_without_successes_has_no_percentiles(self):
+        summary = summarize(1, [], {"500": 2}, 1.0)
+        
+        assert summary["p50_ms"] is None
+        assert summary["errors"] == 2
+    
+    def test_compare_reports_relative_changes_per_concurrency(self):
+        baseline = {"commit": "abc", "levels": [{"concurrency": 8, "rps": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 40.0, "errors": 1}]}
+        current = {"levels": [
+            {"concurrency": 8, "rps": 110.0, "p50_ms": 9.0, "p95_ms": 20.0, "p99_ms": 50.0, "errors": 0},
+            {"concurrency": 32, "rps": 300.0, "p50_ms": 30.0, "p95_ms": 60.0, "p99_ms": 90.0, "errors": 0}
+        ]}
+        
+        rows = compare(baseline, current)
+        
+        assert rows == [{
+            "concurrency": 8,
+            "baseline_commit": "abc",
+            "rps_change_percent": 10.0,
+            "p50_ms_change_percent": -10.0,
+            "p95_ms_change_percent": 0.0,
+            "p99_ms_change_percent": 25.0,
+            "errors_delta": -1
+        }]
+    
+    def test_descriptions_are_distinct_and_valid_requests(self):
+        descriptions = make_descriptions(500)
+        
+        assert len(set(descriptions)) == 500
+        assert all(3 <= len(description) <= 500 for description in descriptions)
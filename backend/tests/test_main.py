@@ -3,6 +3,7 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch
 
 from backend.main import app
+from backend.core.responses import ORJSONResponse
 from backend.core.dependencies import get_current_user
 
 client = TestClient(app)
@@ -15,6 +16,9 @@ class TestMainApp:
         assert app.title == "Atlas Reliability Framework"
         assert app.version == "1.0.0"
     
+    def test_default_response_class_is_orjson(self):
+        assert app.router.default_response_class is ORJSONResponse
+    
     def test_health_endpoint_registered(self):
         response = client.get("/health")
         assert response.status_code == 200
@@ -37,4 +41,15 @@ class TestMainApp:
     
     def test_openapi_schema_available(self):
         response = client.get("/openapi.json")
-        assert response.status_code == 200
\ No newline at end of file
+        assert response.status_code == 200
+    
+    def test_lifespan_manages_http_clients(self):
+        from backend.services.ollama_service import ollama_service
+        from backend.services.google_books_service import google_books_service
+        
+        with TestClient(app):
+            assert ollama_service.client is not None
+            assert google_books_service.client is not None
+        
+        assert ollama_service.client is None
+        assert google_books_service.client is None
@@ -1,5 +1,17 @@
 import pytest
+from unittest.mock import patch
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import Counter, values
+from backend.core.config import settings
 from backend.core.metrics import (
+    MetricsMiddleware,
+    TopKLabels,
+    active_requests,
+    authenticated_requests_total,
+    mark_process_dead,
+    record_authenticated_request,
+    username_bucket,
     record_request,
     record_request_duration,
     record_external_call,
@@ -8,6 +20,11 @@ from backend.core.metrics import (
     http_requests_total,
     external_api_calls_total
 )
+from backend.main import app
+
+
+def deny():
+    raise HTTPException(status_code=401, detail="Invalid token")
 
 
 class TestMetrics:
@@ -34,4 +51,183 @@ class TestMetrics:
         record_request("GET", "/test_metrics", 200)
         metrics = get_metrics()
         
-        assert isinstance(metrics, bytes)
\ No newline at end of file
+        assert isinstance(metrics, bytes)
+
+
+class TestMetricsMiddleware:
+    @pytest.fixture
+    def client(self):
+        router = APIRouter()
+        
+        @router.post("/items/{item_id}")
+        async def create_item(item_id: int, payload: dict):
+            return {"in_flight": active_requests.labels(endpoint="/api/items/{item_id}")._value.get()}
+        
+        @router.get("/status")
+        async def status():
+            return {
+                "pending": active_requests.labels(endpoint="pending")._value.get(),
+                "route": active_requests.labels(endpoint="/api/status")._value.get()
+            }
+        
+        @router.get("/denied", dependencies=[Depends(deny)])
+        async def denied():
+            return {}
+        
+        @router.get("/boom")
+        async def boom():
+            raise RuntimeError("boom")
+        
+        test_app = FastAPI()
+        test_app.include_router(router, prefix="/api")
+        test_app.add_middleware(MetricsMiddleware)
+        return TestClient(test_app, raise_server_exceptions=False)
+    
+    def _count(self, method, endpoint, status):
+        return http_requests_total.labels(method=method, endpoint=endpoint, status=status)._value.get()
+    
+    def test_labels_use_route_template_and_track_in_flight(self, client):
+        before = self._count("POST", "/api/items/{item_id}", 200)
+        
+        response = client.post("/api/items/42", json={"name": "book"})
+        
+        assert response.json() == {"in_flight": 1}
+        assert self._count("POST", "/api/items/{item_id}", 200) == before + 1
+        assert active_requests.labels(endpoint="/api/items/{item_id}")._value.get() == 0
+    
+    def test_handlers_that_never_receive_are_counted_in_flight(self, client):
+        assert client.get("/api/status").json() == {"pending": 1, "route": 0}
+        assert client.get("/api/status").json() == {"pending": 0, "route": 1}
+        assert active_requests.labels(endpoint="pending")._value.get() == 0
+        assert active_requests.labels(endpoint="/api/status")._value.get() == 0
+    
+    def test_errors_raised_before_the_handler_are_recorded(self, client):
+        before = self._count("GET", "/api/denied", 401)
+        
+        assert client.get("/api/denied").status_code == 401
+        assert self._count("GET", "/api/denied", 401) == before + 1
+    
+    def test_unhandled_exceptions_are_recorded_as_500(self, client):
+        before = self._count("GET", "/api/boom", 500)
+        
+        assert client.get("/api/boom").status_code == 500
+        assert self._count("GET", "/api/boom", 500) == before + 1
+    
+    def test_unknown_paths_share_one_label(self, client):
+        before = self._count("GET", "unmatched", 404)
+        
+        client.get("/api/missing/1")
+        client.get("/api/missing/2")
+        
+        assert self._count("GET", "unmatched", 404) == before + 2
+    
+    def test_unknown_methods_share_one_label(self, client):
+        before = self._count("other", "unmatched", 404)
+        
+        for index in range(3):
+            client.request(f"X{index}", "/api/missing/1")
+        
+        assert self._count("other", "unmatched", 404) == before + 3
+        methods = {sample.labels["method"] for sample in http_requests_total.collect()[0].samples}
+        assert not {"X0", "X1", "X2"} & methods
+    
+    def test_app_routes_are_measured(self):
+        before = self._count("GET", "/health", 200)
+        
+        TestClient(app).get("/health")
+        
+        assert self._count("GET", "/health", 200) == before + 1
+
+
+class TestTopKLabels:
+    def test_first_values_are_tracked_up_to_capacity(self):
+        labels = TopKLabels(2)
+        
+        assert labels.admit("alice") == ("alice", None)
+        assert labels.admit("bob") == ("bob", None)
+        assert labels.admit("carol") == ("other", None)
+    
+    def test_heavy_hitter_replaces_weakest_tracked_value(self):
+        labels = TopKLabels(2)
+        for username in ["alice", "alice", "alice", "bob"]:
+            labels.admit(username)
+        
+        assert labels.admit("carol") == ("other", None)
+        assert labels.admit("carol") == ("carol", "bob")
+        assert set(labels.tracked) == {"alice", "carol"}
+    
+    def test_one_off_values_stay_bounded(self):
+        labels = TopKLabels(3)
+        
+        for index in range(1000):
+            labels.admit(f"user{index}")
+        
+        assert len(labels.tracked) == 3
+        assert len(labels.candidates) == 3
+    
+    def test_zero_capacity_counts_everyone_as_other(self):
+        labels = TopKLabels(0)
+        
+        assert labels.admit("alice") == ("other", None)
+        assert labels.admit("alice") == ("other", None)
+        assert labels.tracked == {}
+    
+    def test_record_authenticated_request_removes_evicted_series(self):
+        with patch("backend.core.metrics.authenticated_users", TopKLabels(1)):
+            record_authenticated_request("heavy_a")
+            record_authenticated_request("heavy_b")
+            record_authenticated_request("heavy_b")
+        
+        usernames = {sample.labels["username"] for sample in authenticated_requests_total.collect()[0].samples}
+        assert "heavy_b" in usernames
+        assert "heavy_a" not in usernames
+    
+    def test_evicted_counts_are_folded_into_other(self):
+        counter = Counter("authenticated_probe_total", "Probe counter", ["username"], registry=None)
+        with patch("backend.core.metrics.authenticated_users", TopKLabels(1)), \
+             patch("backend.core.metrics.authenticated_requests_total", counter):
+            for username in ["heavy_a", "heavy_a", "heavy_b", "heavy_b", "heavy_b", "light"]:
+                record_authenticated_request(username)
+        
+        counts = {sample.labels["username"]: sample.value for sample in counter.collect()[0].samples if sample.name.endswith("_total")}
+        assert sum(counts.values()) == 6
+        assert "heavy_a" not in counts
+
+
+class TestMultiprocessMetrics:
+    def test_get_metrics_aggregates_worker_files(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        monkeypatch.setattr(values, "ValueClass", values.MultiProcessValue(lambda: 101))
+        worker_counter = Counter("multiprocess_probe_total", "Probe counter", registry=None)
+        worker_counter.inc(3)
+        
+        assert b"multiprocess_probe_total 3.0" in get_metrics()
+    
+    def test_usernames_are_hashed_into_buckets_in_multiprocess_mode(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        monkeypatch.setattr(values, "ValueClass", values.MultiProcessValue(lambda: 101))
+        monkeypatch.setattr(settings, "metrics_username_hash_buckets", 4)
+        worker_counter = Counter("authenticated_probe_total", "Probe counter", ["username"], registry=None)
+        usernames = [f"user{index}" for index in range(50)] + ["alice"] * 10
+        with patch("backend.core.metrics.authenticated_users", TopKLabels(1)), \
+             patch("backend.core.metrics.authenticated_requests_total", worker_counter):
+            for username in usernames:
+                record_authenticated_request(username)
+        
+        samples = [sample for sample in worker_counter.collect()[0].samples if sample.name.endswith("_total")]
+        assert {sample.labels["username"] for sample in samples} <= {"user_0", "user_1", "user_2", "user_3"}
+        assert sum(sample.value for sample in samples) == 60
+        assert b'username="alice"' not in get_metrics()
+    
+    def test_username_bucket_is_stable(self, monkeypatch):
+        monkeypatch.setattr(settings, "metrics_username_hash_buckets", 8)
+        
+        assert username_bucket("alice") == username_bucket("alice")
+        assert len({username_bucket(f"user{index}") for index in range(200)}) == 8
+    
+    def test_mark_process_dead_is_a_noop_without_multiprocess_dir(self, monkeypatch):
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+        with patch("backend.core.metrics.multiprocess.mark_process_dead") as mock_mark:
+            mark_process_dead(123)
+        
+        mock_mark.assert_not_called()
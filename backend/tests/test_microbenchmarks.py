@@ -0,0 +1,168 @@
+import gc
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Tuple
+from unittest.mock import patch
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from backend.core.dependencies import get_current_user
+from backend.core.metrics import record_request, record_request_duration
+from backend.core.security import create_access_token
+from backend.models.schemas import BookResult, BookSearchResponse
+from backend.services.auth_service import token_cache, user_cache, verify_token
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("RUN_MICROBENCHMARKS"),
+    reason="set RUN_MICROBENCHMARKS=1 to run microbenchmarks"
+)
+
+BASELINES_PATH = Path(__file__).with_name("microbenchmark_baselines.json")
+THRESHOLD_PERCENT = float(os.getenv("MICROBENCHMARK_THRESHOLD_PERCENT", "25"))
+UPDATE_BASELINES = bool(os.getenv("MICROBENCHMARK_UPDATE_BASELINES"))
+BASELINE_SAMPLES = 5
+
+USER = {"id": 1, "username": "benchuser", "is_active": True}
+BOOK = {
+    "title": "The Dragon Quest",
+    "authors": ["First Author", "Second Author"],
+    "description": "A long description of the book. " * 20,
+    "categories": ["Fiction", "Fantasy"],
+    "thumbnail": "http://books.google.com/books/content?id=abc&printsec=frontcover&img=1"
+}
+
+
+def _calibration_workload() -> int:
+    total = 0
+    for index in range(1000):
+        total += index * index
+    return total
+
+
+def _time(fn, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number
+
+
+def measure(fn, number: int, rounds: int = 15) -> Tuple[float, float]:
+    fn_timings, calibration_timings = [], []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            calibration_timings.append(_time(_calibration_workload, 50))
+            fn_timings.append(_time(fn, number))
+    finally:
+        if enabled:
+            gc.enable()
+    return min(fn_timings), min(calibration_timings)
+
+
+def run_to_completion(coro):
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("benchmarked coroutine suspended")
+
+
+def relative_cost(fn, number: int) -> Tuple[float, float]:
+    seconds, calibration = measure(fn, number)
+    return seconds / calibration, seconds
+
+
+def check_against_baseline(name: str, fn, number: int, attempts: int = 3) -> None:
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    
+    if UPDATE_BASELINES:
+        costs = sorted(relative_cost(fn, number)[0] for _ in range(BASELINE_SAMPLES))
+        baselines[name] = round(costs[len(costs) // 2], 4)
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return
+    
+    if name not in baselines:
+        pytest.skip(f"no stored baseline for {name}")
+    
+    limit = baselines[name] * (1 + THRESHOLD_PERCENT / 100)
+    for _ in range(attempts):
+        cost, seconds = relative_cost(fn, number)
+        if cost <= limit:
+            return
+    pytest.fail(
+        f"{name} costs {cost:.4f} calibration units ({seconds * 1e6:.2f}us), "
+        f"baseline {baselines[name]:.4f}, allowed up to {limit:.4f} (+{THRESHOLD_PERCENT:g}%)"
+    )
+
+
+class FakeConnection:
+    async def fetchrow(self, query, username):
+        return USER
+
+
+@asynccontextmanager
+async def fake_async_db():
+    yield FakeConnection()
+
+
+class TestAuthMicrobenchmarks:
+    def test_verify_token_decode(self):
+        token = create_access_token({"sub": "benchuser"})
+        
+        def decode():
+            token_cache.clear()
+            verify_token(token)
+        
+        check_against_baseline("verify_token_decode", decode, 500)
+    
+    def test_verify_token_cached(self):
+        token = create_access_token({"sub": "benchuser"})
+        verify_token(token)
+        
+        check_against_baseline("verify_token_cached", lambda: verify_token(token), 5000)
+    
+    def test_get_current_user_cached(self):
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": "benchuser"}))
+        user_cache.set("benchuser", USER)
+        
+        check_against_baseline("get_current_user_cached", lambda: run_to_completion(get_current_user(credentials)), 5000)
+    
+    def test_get_current_user_database_lookup(self):
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": "benchuser"}))
+        
+        def authenticate():
+            user_cache.clear()
+            run_to_completion(get_current_user(credentials))
+        
+        with patch("backend.core.dependencies.get_async_db", fake_async_db):
+            check_against_baseline("get_current_user_database_lookup", authenticate, 2000)
+
+
+class TestMetricsMicrobenchmarks:
+    def test_record_request(self):
+        def record():
+            record_request("POST", "/books/search", 200)
+            record_request_duration("POST", "/books/search", 0.042)
+        
+        check_against_baseline("record_request", record, 5000)
+
+
+class TestSchemaMicrobenchmarks:
+    def test_book_result_construction(self):
+        check_against_baseline("book_result_construction", lambda: BookResult(**BOOK), 5000)
+    
+    def test_book_search_response_construction(self):
+        def build():
+            BookSearchResponse(
+                total_items=1200,
+                query_keywords="dragon quest magic",
+                items=[BookResult(**BOOK) for _ in range(10)]
+            )
+        
+        check_against_baseline("book_search_response_construction", build, 1000)
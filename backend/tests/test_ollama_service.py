@@ -1,6 +1,10 @@
+import asyncio
+import json
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from backend.services.ollama_service import OllamaService
+from backend.services.ollama_service import OllamaService, normalize_description, parse_numbered_keywords
+from backend.services.keyword_extractor import local_keyword_extractor
+from backend.core.metrics import keyword_extractor_wins_total
 
 
 @pytest.fixture
@@ -16,7 +20,7 @@ class TestOllamaService:
         mock_response.raise_for_status = MagicMock()
         
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
             
             result = await service.extract_keywords("A book about wizards and dragons")
             
@@ -31,7 +35,7 @@ class TestOllamaService:
         mock_response.raise_for_status = MagicMock()
         
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
             
             result = await service.extract_keywords("Science book")
             
@@ -46,7 +50,7 @@ class TestOllamaService:
         mock_response.raise_for_status = MagicMock()
         
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
             
             result = await service.extract_keywords("Action packed thriller")
             
@@ -56,8 +60,10 @@ class TestOllamaService:
     
     @pytest.mark.asyncio
     async def test_extract_keywords_fallback_on_error(self, service):
+        service.local_extractor_enabled = False
+        
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(side_effect=Exception("API Error"))
+            mock_client.return_value.post = AsyncMock(side_effect=Exception("API Error"))
             
             result = await service.extract_keywords("Any description")
             
@@ -73,7 +79,7 @@ class TestOllamaService:
         
         with patch("httpx.AsyncClient") as mock_client:
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
             
             await service.extract_keywords("A fantasy book")
             
@@ -81,4 +87,293 @@ class TestOllamaService:
             json_data = call_args.kwargs["json"]
             assert "A fantasy book" in json_data["prompt"]
             assert json_data["model"] == "gemma3:270m"
-            assert json_data["stream"] is False
\ No newline at end of file
+            assert json_data["stream"] is False
+    
+    @pytest.mark.asyncio
+    async def test_extract_keywords_reuses_shared_client(self, service):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": "one two three"}
+        mock_response.raise_for_status = MagicMock()
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
+            
+            await service.extract_keywords("First description")
+            await service.extract_keywords("Second description")
+            
+            assert mock_client.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_close_releases_client(self, service):
+        await service.start()
+        assert service.client is not None
+        
+        await service.close()
+        
+        assert service.client is None
+    
+    @pytest.mark.asyncio
+    async def test_extract_keywords_serves_normalized_repeats_from_cache(self, service):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": "fantasy adventure magic"}
+        mock_response.raise_for_status = MagicMock()
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_post = AsyncMock(return_value=mock_response)
+            mock_client.return_value.post = mock_post
+            
+            first = await service.extract_keywords("A book about Wizards, and dragons!")
+            second = await service.extract_keywords("a book   about wizards and dragons")
+            
+            assert first == second
+            assert mock_post.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_extract_keywords_does_not_cache_fallback(self, service):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": "fantasy adventure magic"}
+        mock_response.raise_for_status = MagicMock()
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.post = AsyncMock(side_effect=[Exception("API Error"), mock_response])
+            
+            fallback = await service.extract_keywords("A book about wizards")
+            recovered = await service.extract_keywords("A book about wizards")
+            
+            assert fallback == local_keyword_extractor.extract_keywords("A book about wizards")
+            assert recovered["keyword_1"] == "fantasy"
+
+
+def test_normalize_description_folds_case_whitespace_and_punctuation():
+    assert normalize_description("  Hello,   WORLD!\n") == "hello world"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_descriptions_share_one_generation(service):
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"response": "fantasy adventure magic"}
+    mock_response.raise_for_status = MagicMock()
+    
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+    
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_post = AsyncMock(side_effect=slow_post)
+        mock_client.return_value.post = mock_post
+        
+        results = await asyncio.gather(*[service.extract_keywords("A book about wizards") for _ in range(4)])
+        
+        assert all(result["keyword_1"] == "fantasy" for result in results)
+        assert mock_post.call_count == 1
+
+
+class TestKeywordBatching:
+    @pytest.fixture
+    def batched_service(self, service):
+        service.batcher.window = 0.01
+        service.batcher.max_size = 8
+        return service
+    
+    def make_response(self, text):
+        response = MagicMock()
+        response.json.return_value = {"response": text}
+        response.raise_for_status = MagicMock()
+        return response
+    
+    @pytest.mark.asyncio
+    async def test_batch_sends_one_multi_item_prompt(self, batched_service):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_post = AsyncMock(return_value=self.make_response("1: space opera war\n2. cozy village mystery\n3) dragon quest magic"))
+            mock_client.return_value.post = mock_post
+            
+            results = await asyncio.gather(
+                batched_service.extract_keywords("Space battles"),
+                batched_service.extract_keywords("A murder in a small village"),
+                batched_service.extract_keywords("Dragons and wizards")
+            )
+            
+            assert mock_post.call_count == 1
+            prompt = mock_post.call_args.kwargs["json"]["prompt"]
+            assert "1. Space battles" in prompt
+            assert "3. Dragons and wizards" in prompt
+            assert [result["keyword_1"] for result in results] == ["space", "cozy", "dragon"]
+    
+    @pytest.mark.asyncio
+    async def test_unparsed_items_fall_back_to_single_generation(self, batched_service):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_post = AsyncMock(side_effect=[
+                self.make_response("1: space opera war"),
+                self.make_response("cozy village mystery")
+            ])
+            mock_client.return_value.post = mock_post
+            
+            results = await asyncio.gather(
+                batched_service.extract_keywords("Space battles"),
+                batched_service.extract_keywords("A murder in a small village")
+            )
+            
+            assert mock_post.call_count == 2
+            assert results[1]["keyword_1"] == "cozy"
+    
+    @pytest.mark.asyncio
+    async def test_parallel_mode_sends_individual_generations(self, batched_service):
+        batched_service.batcher.mode = "parallel"
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_post = AsyncMock(return_value=self.make_response("one two three"))
+            mock_client.return_value.post = mock_post
+            
+            await asyncio.gather(
+                batched_service.extract_keywords("First description"),
+                batched_service.extract_keywords("Second description")
+            )
+            
+            assert mock_post.call_count == 2
+            assert "Extract exactly 3 keywords from this book description" in mock_post.call_args.kwargs["json"]["prompt"]
+    
+    @pytest.mark.asyncio
+    async def test_full_batch_is_flushed_without_waiting_for_window(self, batched_service):
+        batched_service.batcher.window = 10
+        batched_service.batcher.max_size = 2
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.post = AsyncMock(return_value=self.make_response("1: a b c\n2: d e f"))
+            
+            results = await asyncio.wait_for(asyncio.gather(
+                batched_service.extract_keywords("First description"),
+                batched_service.extract_keywords("Second description")
+            ), timeout=1)
+            
+            assert [result["keyword_1"] for result in results] == ["a", "d"]
+    
+    @pytest.mark.asyncio
+    async def test_batch_failure_falls_back_to_default_keywords(self, batched_service):
+        batched_service.batcher.mode = "parallel"
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.post = AsyncMock(side_effect=Exception("API Error"))
+            
+            results = await asyncio.gather(
+                batched_service.extract_keywords("First description"),
+                batched_service.extract_keywords("Second description")
+            )
+            
+            assert results == [
+                local_keyword_extractor.extract_keywords("First description"),
+                local_keyword_extractor.extract_keywords("Second description")
+            ]
+
+
+def test_parse_numbered_keywords_ignores_unnumbered_and_out_of_range_lines():
+    results = parse_numbered_keywords("Here you go:\n2: alpha beta\n5: ignored words here", 2)
+    
+    assert results[0] is None
+    assert results[1] == {"keyword_1": "alpha", "keyword_2": "beta", "keyword_3": "book"}
+
+
+class TestKeywordStreaming:
+    def make_stream(self, chunks):
+        response = MagicMock()
+        response.raise_for_status = MagicMock()
+        consumed = []
+        
+        async def aiter_lines():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield json.dumps(chunk)
+        
+        response.aiter_lines = aiter_lines
+        return response, consumed
+    
+    @pytest.mark.asyncio
+    async def test_stops_reading_once_three_keywords_are_complete(self, service):
+        response, consumed = self.make_stream([
+            {"response": "space "},
+            {"response": "opera"},
+            {"response": " war"},
+            {"response": " extra"},
+            {"response": " words", "done": True}
+        ])
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream.return_value.__aenter__.return_value = response
+            
+            result = await service.extract_keywords_streaming("Space battles")
+            
+            assert result == {"keyword_1": "space", "keyword_2": "opera", "keyword_3": "war"}
+            assert len(consumed) == 4
+            assert mock_client.return_value.stream.call_args.kwargs["json"]["stream"] is True
+    
+    @pytest.mark.asyncio
+    async def test_streaming_result_is_cached(self, service):
+        response, _ = self.make_stream([{"response": "space opera war", "done": True}])
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream.return_value.__aenter__.return_value = response
+            
+            await service.extract_keywords_streaming("Space battles")
+            result = await service.extract_keywords("space battles")
+            
+            assert result["keyword_1"] == "space"
+            assert mock_client.return_value.stream.call_count == 1
+            mock_client.return_value.post.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_streaming_falls_back_on_error(self, service):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.stream.side_effect = Exception("API Error")
+            
+            result = await service.extract_keywords_streaming("Space battles")
+            
+            assert result == local_keyword_extractor.extract_keywords("Space battles")
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_returns_fallback_without_calling_ollama(service):
+    service.breaker.failure_threshold = 1
+    
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_post = AsyncMock(side_effect=Exception("API Error"))
+        mock_client.return_value.post = mock_post
+        
+        await service.extract_keywords("First description")
+        result = await service.extract_keywords("Second description")
+        
+        assert result == local_keyword_extractor.extract_keywords("Second description")
+        assert mock_post.call_count == 1
+
+
+class TestLocalExtractorRace:
+    @pytest.mark.asyncio
+    async def test_error_falls_back_to_local_extractor(self, service):
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.post = AsyncMock(side_effect=Exception("API Error"))
+            
+            result = await service.extract_keywords("A book about wizards and dragons")
+            
+            assert result == {"keyword_1": "wizards", "keyword_2": "dragons", "keyword_3": "book"}
+    
+    @pytest.mark.asyncio
+    async def test_slow_ollama_loses_to_local_extractor_and_warms_cache(self, service):
+        service.deadline = 0.01
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": "fantasy adventure magic"}
+        mock_response.raise_for_status = MagicMock()
+        local_wins = keyword_extractor_wins_total.labels(extractor="local")._value.get()
+        
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return mock_response
+        
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_client.return_value.post = AsyncMock(side_effect=slow_post)
+            
+            result = await service.extract_keywords("A book about wizards and dragons")
+            
+            assert result["keyword_1"] == "wizards"
+            assert keyword_extractor_wins_total.labels(extractor="local")._value.get() == local_wins + 1
+            
+            await asyncio.sleep(0.1)
+            
+            assert (await service.extract_keywords("A book about wizards and dragons"))["keyword_1"] == "fantasy"
@@ -1,9 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from backend.main import app
 from backend.core.dependencies import get_current_user
+from backend.core.metrics import TopKLabels
 
 client = TestClient(app)
 
@@ -52,12 +53,10 @@ def test_books_search_inactive_user():
     inactive_user = {"id": 1, "username": "inactive", "is_active": False}
     
     with patch("backend.core.dependencies.verify_token", return_value="inactive"):
-        with patch("backend.core.dependencies.get_connection") as mock_get_conn:
+        with patch("backend.core.dependencies.get_async_db") as mock_get_db:
             mock_conn = Mock()
-            mock_cursor = Mock()
-            mock_cursor.fetchone.return_value = (1, "inactive", False)
-            mock_conn.cursor.return_value = mock_cursor
-            mock_get_conn.return_value = mock_conn
+            mock_conn.fetchrow = AsyncMock(return_value={"id": 1, "username": "inactive", "is_active": False})
+            mock_get_db.return_value.__aenter__.return_value = mock_conn
             
             response = client.post(
                 "/books/search",
@@ -66,4 +65,63 @@ def test_books_search_inactive_user():
             )
             
             assert response.status_code == 401
-            assert "Inactive user" in response.json()["detail"]
\ No newline at end of file
+            assert "Inactive user" in response.json()["detail"]
+
+
+def test_current_user_is_served_from_cache():
+    with patch("backend.core.dependencies.verify_token", return_value="cached"):
+        with patch("backend.core.dependencies.get_async_db") as mock_get_db:
+            mock_conn = Mock()
+            mock_conn.fetchrow = AsyncMock(return_value={"id": 2, "username": "cached", "is_active": False})
+            mock_get_db.return_value.__aenter__.return_value = mock_conn
+            
+            for _ in range(3):
+                response = client.post(
+                    "/books/search",
+                    json={"description": "action books"},
+                    headers={"Authorization": "Bearer valid.token"}
+                )
+                assert response.status_code == 401
+            
+            assert mock_conn.fetchrow.await_count == 1
+
+
+def test_authenticated_requests_are_counted():
+    with patch("backend.core.dependencies.verify_token", return_value="counted"), \
+         patch("backend.core.dependencies.record_authenticated_request") as mock_record, \
+         patch("backend.api.routes.books._find_books", new_callable=AsyncMock, return_value={"total_items": 0, "items": []}), \
+         patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock,
+               return_value={"keyword_1": "a", "keyword_2": "b", "keyword_3": "c"}), \
+         patch("backend.core.dependencies.get_async_db") as mock_get_db:
+        mock_conn = Mock()
+        mock_conn.fetchrow = AsyncMock(return_value={"id": 3, "username": "counted", "is_active": True})
+        mock_get_db.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.post(
+            "/books/search",
+            json={"description": "action books"},
+            headers={"Authorization": "Bearer valid.token"}
+        )
+        
+        assert response.status_code == 200
+        mock_record.assert_called_once_with("counted")
+
+
+def test_disabled_username_labels_do_not_reject_valid_users():
+    with patch("backend.core.dependencies.verify_token", return_value="unlabelled"), \
+         patch("backend.core.metrics.authenticated_users", TopKLabels(0)), \
+         patch("backend.api.routes.books._find_books", new_callable=AsyncMock, return_value={"total_items": 0, "items": []}), \
+         patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock,
+               return_value={"keyword_1": "a", "keyword_2": "b", "keyword_3": "c"}), \
+         patch("backend.core.dependencies.get_async_db") as mock_get_db:
+        mock_conn = Mock()
+        mock_conn.fetchrow = AsyncMock(return_value={"id": 4, "username": "unlabelled", "is_active": True})
+        mock_get_db.return_value.__aenter__.return_value = mock_conn
+        
+        response = client.post(
+            "/books/search",
+            json={"description": "action books"},
+            headers={"Authorization": "Bearer valid.token"}
+        )
+        
+        assert response.status_code == 200
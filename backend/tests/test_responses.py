@@ -0,0 +1,22 @@
+import json
+import numpy as np
+
+from backend.core.responses import ORJSONResponse, ndjson_line
+
+
+class TestORJSONResponse:
+    def test_renders_compact_utf8_json(self):
+        response = ORJSONResponse({"title": "Café", "count": 2})
+        
+        assert response.body == '{"title":"Café","count":2}'.encode("utf-8")
+        assert response.headers["content-type"] == "application/json"
+    
+    def test_renders_numpy_and_non_string_keys(self):
+        response = ORJSONResponse({1: np.float32(0.5), "scores": np.array([1, 2])})
+        
+        assert json.loads(response.body) == {"1": 0.5, "scores": [1, 2]}
+
+
+class TestNdjsonLine:
+    def test_appends_newline(self):
+        assert ndjson_line({"type": "done", "total_items": 3}) == b'{"type":"done","total_items":3}\n'
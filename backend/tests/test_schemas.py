@@ -54,6 +54,18 @@ class TestBookSearchRequest:
     def test_book_search_request_too_long_fails(self):
         with pytest.raises(ValueError):
             BookSearchRequest(description="a" * 501)
+    
+    def test_book_search_request_pagination_defaults(self):
+        request = BookSearchRequest(description="space opera")
+        
+        assert request.start_index == 0
+        assert request.max_results == 10
+    
+    def test_book_search_request_rejects_out_of_range_pages(self):
+        with pytest.raises(ValueError):
+            BookSearchRequest(description="space opera", start_index=-1)
+        with pytest.raises(ValueError):
+            BookSearchRequest(description="space opera", max_results=41)
 
 
 class TestBookResult:
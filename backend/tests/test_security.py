@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import pytest
+
+from backend.core.security import PasswordHasher, PasswordHasherBusyError
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher("thread", max_workers=1, max_queue=1)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_runs_on_executor(self, hasher):
+        caller = threading.get_ident()
+        
+        worker = await hasher.run("hash", threading.get_ident)
+        
+        assert worker != caller
+    
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self, hasher):
+        release = threading.Event()
+        pending = asyncio.ensure_future(hasher.run("hash", release.wait))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.run("verify", lambda: True)
+        
+        release.set()
+        assert await pending is True
+        assert await hasher.run("verify", lambda: True) is True
+    
+    @pytest.mark.asyncio
+    async def test_process_executor_hashes_passwords(self):
+        hasher = PasswordHasher("process", max_workers=1, max_queue=4)
+        try:
+            assert await hasher.run("hash", pow, 2, 10) == 1024
+            assert hasher._executor._mp_context.get_start_method() == "forkserver"
+        finally:
+            hasher.shutdown()
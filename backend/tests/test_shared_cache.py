@@ -0,0 +1,76 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.core.cache import TTLCache
+from backend.services.shared_cache import SharedCache, sweep_expired_entries
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    conn.fetchrow = AsyncMock(return_value=None)
+    conn.execute = AsyncMock(return_value="DELETE 0")
+    with patch("backend.services.shared_cache.get_async_db") as mock_get_db:
+        mock_get_db.return_value.__aenter__.return_value = conn
+        yield conn
+
+
+@pytest.fixture
+def cache():
+    return SharedCache("test", TTLCache("test_local", maxsize=10, ttl=60, stale_ttl=30), enabled=True)
+
+
+class TestSharedCache:
+    @pytest.mark.asyncio
+    async def test_local_hit_skips_database(self, cache, mock_conn):
+        cache.local.set("key", {"a": 1})
+        
+        assert await cache.get("key") == {"a": 1}
+        mock_conn.fetchrow.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_shared_hit_populates_local_tier_with_age(self, cache, mock_conn):
+        mock_conn.fetchrow.return_value = {"value": json.dumps({"a": 1}), "age": 70.0}
+        
+        assert await cache.get_stale("key") == ({"a": 1}, 70.0)
+        assert await cache.get("key") is None
+        
+        value, age = cache.local.get_stale("key")
+        assert value == {"a": 1}
+        assert age >= 70.0
+        assert mock_conn.fetchrow.call_args.args[1:] == ("test", "key")
+    
+    @pytest.mark.asyncio
+    async def test_set_upserts_in_background(self, cache, mock_conn):
+        cache.set("key", {"a": 1})
+        await asyncio.gather(*cache._writes)
+        
+        query, namespace, key, value, ttl = mock_conn.execute.call_args.args
+        assert "ON CONFLICT (namespace, cache_key) DO UPDATE" in query
+        assert (namespace, key, json.loads(value), ttl) == ("test", "key", {"a": 1}, 90)
+        assert cache.local.get("key") == {"a": 1}
+    
+    @pytest.mark.asyncio
+    async def test_database_errors_are_treated_as_misses(self, cache, mock_conn):
+        mock_conn.fetchrow.side_effect = OSError("connection refused")
+        
+        assert await cache.get("key") is None
+    
+    @pytest.mark.asyncio
+    async def test_disabled_cache_never_touches_database(self, mock_conn):
+        cache = SharedCache("test", TTLCache("test_disabled", maxsize=10, ttl=60), enabled=False)
+        
+        cache.set("key", 1)
+        assert await cache.get("missing") is None
+        
+        mock_conn.fetchrow.assert_not_called()
+        mock_conn.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_sweep_deletes_expired_entries(self, mock_conn):
+        mock_conn.execute.return_value = "DELETE 7"
+        
+        assert await sweep_expired_entries() == 7
+        assert "expires_at <= now()" in mock_conn.execute.call_args.args[0]
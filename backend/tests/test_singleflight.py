@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+
+from backend.core.singleflight import SingleFlight
+from backend.core.metrics import singleflight_coalesced_total
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight("test_share")
+        calls = 0
+        
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+        
+        results = await asyncio.gather(*[flights.do("key", work) for _ in range(5)])
+        
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert len(flights) == 0
+        assert singleflight_coalesced_total.labels(operation="test_share")._value.get() == 4
+    
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        flights = SingleFlight("test_keys")
+        
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+        
+        results = await asyncio.gather(flights.do("a", lambda: work(1)), flights.do("b", lambda: work(2)))
+        
+        assert results == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_caller(self):
+        flights = SingleFlight("test_errors")
+        
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+        
+        results = await asyncio.gather(*[flights.do("key", work) for _ in range(3)], return_exceptions=True)
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(flights) == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flights = SingleFlight("test_cancel_one")
+        
+        async def work():
+            await asyncio.sleep(0.02)
+            return "result"
+        
+        first = asyncio.ensure_future(flights.do("key", work))
+        second = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == "result"
+        assert first.cancelled()
+    
+    @pytest.mark.asyncio
+    async def test_call_is_cancelled_when_all_callers_leave(self):
+        flights = SingleFlight("test_cancel_all")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+        
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        caller = asyncio.ensure_future(flights.do("key", work))
+        await started.wait()
+        caller.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        
+        assert cancelled.is_set()
+        assert len(flights) == 0
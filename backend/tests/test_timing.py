@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.core.dependencies import get_current_user
+from backend.core.metrics import request_stage_duration_seconds
+from backend.core.timing import ServerTimingMiddleware, server_timing, span
+from backend.main import app
+
+
+def _observations(stage):
+    for metric in request_stage_duration_seconds.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels["stage"] == stage:
+                return sample.value
+    return 0
+
+
+def timed_client(sample_rate):
+    test_app = FastAPI()
+    
+    @test_app.get("/work")
+    async def work():
+        with span("first"):
+            pass
+        with span("second"):
+            pass
+        return {}
+    
+    test_app.add_middleware(ServerTimingMiddleware, sample_rate=sample_rate)
+    return TestClient(test_app)
+
+
+class TestSpan:
+    def test_span_without_recorder_is_a_noop(self):
+        with span("idle"):
+            value = 1
+        
+        assert value == 1
+    
+    def test_server_timing_format(self):
+        assert server_timing([("auth", 0.0012), ("keywords", 0.25)], 0.3) == \
+            b"auth;dur=1.20, keywords;dur=250.00, total;dur=300.00"
+
+
+class TestServerTimingMiddleware:
+    def test_sampled_requests_get_header_and_histogram(self):
+        before = _observations("first")
+        
+        response = timed_client(1.0).get("/work")
+        
+        entries = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+        assert entries == ["first", "second", "total"]
+        assert _observations("first") == before + 1
+    
+    def test_unsampled_requests_are_untouched(self):
+        before = _observations("first")
+        
+        response = timed_client(0.0).get("/work")
+        
+        assert "server-timing" not in response.headers
+        assert _observations("first") == before
+    
+    def test_search_stages_are_reported(self):
+        app.dependency_overrides[get_current_user] = lambda: {"id": 1, "username": "testuser", "is_active": True}
+        try:
+            with patch("backend.core.timing.random.random", return_value=0.0), \
+                 patch("backend.api.routes.books.ollama_service.extract_keywords", new_callable=AsyncMock,
+                       return_value={"keyword_1": "a", "keyword_2": "b", "keyword_3": "c"}), \
+                 patch("backend.api.routes.books.book_catalog.search", new_callable=AsyncMock, return_value=None), \
+                 patch("backend.api.routes.books.google_books_service.search_books", new_callable=AsyncMock,
+                       return_value={"total_items": 0, "items": []}):
+                response = TestClient(app).post("/books/search", json={"description": "dragons"})
+        finally:
+            app.dependency_overrides = {}
+        
+        stages = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+        assert stages == ["keywords", "book_catalog", "google_books", "books", "render", "total"]